@@ -0,0 +1,42 @@
+import pytest
+
+from pages.dashboard_page import DashboardPage
+from pages.login_page import LoginPage
+
+
+class TestPageBenchmarks:
+
+    # ---- Login form fill ----
+    def test_login_form_fill(self, driver, bench, fixture_url):
+        driver.get(fixture_url("login.html"))
+
+        def fill():
+            # New page object each time, like the tests do
+            login_page = LoginPage(driver)
+            login_page.enter_username("Admin")
+            login_page.enter_password("admin123")
+
+        bench("login_form_fill", fill)
+
+    # ---- Dashboard ----
+    @pytest.fixture
+    def dashboard(self, driver, fixture_url):
+        driver.get(fixture_url("dashboard.html"))
+        return DashboardPage(driver)
+
+    def test_get_title_widgets(self, dashboard, bench):
+        result = bench("get_title_widgets", dashboard.get_title_widgets)
+        assert result["commands"] > 0
+
+    def test_search(self, dashboard, bench):
+        def search():
+            dashboard.search_dashboard("admin")
+            assert len(dashboard.search_result_items()) == 1
+
+        bench("search_dashboard+search_result_items", search)
+
+    def test_click_all_visible_btn(self, dashboard, bench):
+        def click_all():
+            assert dashboard.click_all_visible_btn(dashboard.get_quick_btn()) == 6
+
+        bench("click_all_visible_btn", click_all)
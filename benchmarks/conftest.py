@@ -0,0 +1,163 @@
+"""
+Micro-benchmark cho page object, chạy trên trang HTML tĩnh trong benchmarks/fixtures/.
+
+    pytest benchmarks/bench_pages.py                       # so với baseline, fail nếu chậm hơn ngưỡng
+    pytest benchmarks/bench_pages.py --bench-update        # ghi lại baseline
+    pytest benchmarks/bench_pages.py --bench-threshold 0.5 # cho phép chậm hơn 50%
+    pytest benchmarks/bench_pages.py --bench-strict        # thiếu baseline -> fail (CI)
+
+baselines.json phụ thuộc máy đo nên không commit sẵn: ghi một lần bằng --bench-update trên
+máy / runner dùng để so. Operation chưa có baseline được cảnh báo và liệt kê cuối phiên.
+Benchmark không ghi vào report.json/report.xml, .test_durations.json, .flaky_history.json.
+"""
+import json
+import os
+import statistics
+import time
+import warnings
+from contextlib import contextmanager
+
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baselines.json")
+
+_measurements = {}
+_missing = []   # operations measured without a baseline
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-warmup", type=int, default=3, help="Số lần chạy warm-up (không tính)")
+    group.addoption("--bench-iterations", type=int, default=20, help="Số lần chạy được đo")
+    group.addoption("--bench-threshold", type=float, default=0.25,
+                    help="Median chậm hơn baseline quá tỉ lệ này -> fail (0.25 = 25%%)")
+    group.addoption("--bench-update", action="store_true", default=False, help="Ghi kết quả làm baseline mới")
+    group.addoption("--bench-strict", action="store_true", default=False,
+                    help="Operation chưa có baseline -> fail thay vì cảnh báo")
+
+
+@pytest.fixture
+def fixture_url():
+    # file:// URL of a page in benchmarks/fixtures/
+    def url(name):
+        return "file:///" + os.path.join(FIXTURE_DIR, name).replace(os.sep, "/").lstrip("/")
+    return url
+
+
+@contextmanager
+def count_commands(driver):
+    # Count WebDriver commands (HTTP round trips) sent through `driver`
+    counter = {"commands": 0}
+    original = driver.execute
+
+    def counting(driver_command, params=None):
+        counter["commands"] += 1
+        return original(driver_command, params)
+
+    driver.execute = counting
+    try:
+        yield counter
+    finally:
+        del driver.execute   # back to the class method
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+@pytest.fixture
+def bench(request, driver):
+    """
+    bench(name, operation, setup=None): chạy warm-up + N lần đo, trả về
+    {median, p95, commands}; so với baseline trừ khi --bench-update.
+    """
+    config = request.config
+    warmup = config.getoption("--bench-warmup")
+    iterations = config.getoption("--bench-iterations")
+
+    def run(name, operation, setup=None):
+        for _ in range(warmup):
+            if setup:
+                setup()
+            operation()
+
+        samples, commands = [], []
+        for _ in range(iterations):
+            if setup:
+                setup()
+            with count_commands(driver) as counter:
+                start = time.perf_counter()
+                operation()
+                samples.append(time.perf_counter() - start)
+            commands.append(counter["commands"])
+
+        result = {
+            "median": round(statistics.median(samples), 5),
+            "p95": round(percentile(samples, 95), 5),
+            "commands": max(commands),
+        }
+        _measurements[name] = result
+        if not config.getoption("--bench-update"):
+            _check_regression(name, result, config.getoption("--bench-threshold"),
+                              config.getoption("--bench-strict"))
+        return result
+
+    return run
+
+
+def _load_baselines():
+    try:
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _check_regression(name, result, threshold, strict=False):
+    baseline = _load_baselines().get(name)
+    if not baseline:
+        message = f"{name}: no baseline in {os.path.basename(BASELINE_FILE)} (record one with --bench-update)"
+        if strict:
+            pytest.fail(message)
+        _missing.append(name)
+        warnings.warn(pytest.PytestWarning(message))
+        return
+    limit = baseline["median"] * (1 + threshold)
+    assert result["median"] <= limit, (
+        f"{name}: median {result['median'] * 1000:.1f} ms > baseline "
+        f"{baseline['median'] * 1000:.1f} ms + {threshold:.0%}"
+    )
+    assert result["commands"] <= baseline["commands"], (
+        f"{name}: {result['commands']} WebDriver commands > baseline {baseline['commands']}"
+    )
+
+
+def pytest_sessionfinish(session):
+    if _measurements and session.config.getoption("--bench-update"):
+        baselines = _load_baselines()
+        baselines.update(_measurements)
+        tmp = f"{BASELINE_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        os.replace(tmp, BASELINE_FILE)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _measurements:
+        return
+    baselines = _load_baselines()
+    terminalreporter.write_sep("-", "page-object benchmarks")
+    terminalreporter.write_line(f"{'operation':32} {'median ms':>10} {'p95 ms':>8} {'cmds':>5} {'baseline ms':>12}")
+    for name, r in _measurements.items():
+        base = baselines.get(name)
+        base_txt = f"{base['median'] * 1000:.1f}" if base else "-"
+        terminalreporter.write_line(
+            f"{name:32} {r['median'] * 1000:>10.1f} {r['p95'] * 1000:>8.1f} {r['commands']:>5} {base_txt:>12}"
+        )
+    if _missing and not config.getoption("--bench-update"):
+        terminalreporter.write_line(
+            f"NOT CHECKED: {len(_missing)} operation(s) without baseline ({', '.join(_missing)}); "
+            f"run with --bench-update to record them", red=True, bold=True)
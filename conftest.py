@@ -1,41 +1,353 @@
 import pytest
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import sys
+import time
+from dataclasses import asdict
+from functools import partial
+
+# Chỉ import module nhẹ ở đây: selenium, webdriver_manager, pages, requests... được import
+# trong fixture / hook lần đầu cần tới, nên --collect-only hay chạy một test vẫn nhanh
+# (giới hạn được kiểm tra trong tests/test_imports.py)
+from utils import config as settings
+from utils.durations import save_durations
+from utils import flaky
+from utils import lean as lean_profile
+from utils import perf
+from utils import results
+from utils.results import phase
 
 # --- Thư mục lưu screenshot ---
 SCREENSHOT_DIR = os.path.join(os.getcwd(), "screenshots")
 os.makedirs(SCREENSHOT_DIR, exist_ok=True)
 
-# --- File lưu report ---
-REPORT_FILE = os.path.join(os.getcwd(), "report.txt")
+# --- File lưu report (ghi một lần lúc kết thúc session) ---
+REPORT_JSON = os.path.join(os.getcwd(), "report.json")
+REPORT_JUNIT = os.path.join(os.getcwd(), "report.xml")
+
+# --- Chế độ worker (python -m utils.parallel): mỗi worker ghi vào thư mục riêng ---
+WORKER_DIR = os.environ.get("PYTEST_WORKER_DIR")
+
+# Micro-benchmark (benchmarks/): không ghi report, thời gian, lịch sử flaky
+BENCHMARK_PREFIX = "benchmarks/"
+
+
+def _is_benchmark(nodeid):
+    return nodeid.replace(os.sep, "/").startswith(BENCHMARK_PREFIX)
+
+
+# Thời gian chạy (setup + call + teardown) của từng test trong session này
+_durations = {}
+
+# pass / flaky / fail của từng test trong session này (lịch sử flaky)
+_outcomes = {}
+
+# Kết quả + thời gian theo phase của từng test, giữ trong bộ nhớ tới cuối session
+_results = results.ResultsSink()
+
+
+# --- Option dòng lệnh ---
+def pytest_addoption(parser):
+    parser.addoption(
+        "--pool-size", type=int, default=1,
+        help="Số Chrome khởi động sẵn trong pool dùng chung cho cả session",
+    )
+    parser.addoption(
+        "--offline", action="store_true", default=False,
+        help="Chỉ dùng chromedriver có sẵn trên máy, không tải mới",
+    )
+    parser.addoption(
+        "--standin", action="store_true", default=False,
+        help="Chạy với stand-in OrangeHRM local (bản ghi trong standin_capture/, xem utils/standin.py)",
+    )
+    parser.addoption(
+        "--standin-capture", metavar="PATH", default=None,
+        help="Thư mục bản ghi cho --standin (ngầm bật --standin; mặc định: ORANGEHRM_STANDIN_CAPTURE "
+             "hoặc standin_capture/)",
+    )
+    parser.addoption(
+        "--lean", action="store_true", default=False,
+        help="Chrome headless, viewport cố định, chặn ảnh/font/media/analytics (xem utils/lean.py)",
+    )
+    parser.addoption(
+        "--perf", action="store_true", default=False,
+        help="Đo Navigation/Resource Timing + long task của OrangeHRM, ghi vào .perf_history.jsonl (xem utils/perf.py)",
+    )
+    parser.addoption(
+        "--memory", action="store_true", default=False,
+        help="Đo RSS/CPU của chromedriver + Chrome và JS heap trước/sau mỗi test (xem utils/memory.py)",
+    )
+    parser.addoption(
+        "--memory-ceiling", type=int, default=None,
+        help="MB; browser vượt ngưỡng sau test bị bỏ khỏi pool và thay browser mới (mặc định 1024 khi --memory)",
+    )
+    parser.addoption(
+        "--retries", type=int, default=0,
+        help="Số lần chạy lại thân test trên cùng driver khi gặp lỗi tạm thời "
+             "(mặc định 0 = tắt; bật rõ ràng, vd. trong CI: --retries 1)",
+    )
+    parser.addoption(
+        "--flaky-threshold", type=float, default=flaky.THRESHOLD,
+        help="Tỉ lệ flaky (theo .flaky_history.json) từ đó test bị quarantine (xfail không strict)",
+    )
+    parser.addoption(
+        "--no-quarantine", action="store_true", default=False,
+        help="Chạy cả test đang bị quarantine như bình thường",
+    )
+    parser.addoption(
+        "--screenshot-max-width", type=int, default=1280,
+        help="Thu nhỏ screenshot khi test fail về chiều rộng này (0 = giữ nguyên)",
+    )
+
+
+def pytest_configure(config):
+    # --standin: bật server local trong process và trỏ toàn bộ URL về localhost
+    capture_dir = config.getoption("--standin-capture")
+    if (config.getoption("--standin") or capture_dir) and not config.getoption("--collect-only"):
+        from utils.standin import Capture, StandinServer
+        try:
+            config._standin_server = StandinServer(capture=Capture(capture_dir) if capture_dir else None).start()
+        except RuntimeError as exc:
+            raise pytest.UsageError(str(exc))
+        settings.set_base_url(config._standin_server.origin)
+
+    config.addinivalue_line(
+        "markers", "visual: test kiểm tra giao diện, không chặn ảnh/font khi chạy --lean"
+    )
+    # Bytes / request tiết kiệm được của từng test khi chạy --lean; kích thước resource
+    # được học ở cả lần chạy không --lean để ước lượng phần bị chặn
+    config._lean_usage = {}
+    config._lean_sizes = None if config.getoption("--collect-only") else lean_profile.SizeBook()
+    # Page object chỉ gọi script đo hiệu năng khi bật --perf
+    perf.RECORDER.enabled = config.getoption("--perf")
+    # --memory / --memory-ceiling: watchdog bộ nhớ quanh fixture driver
+    config._memory = None
+    ceiling = config.getoption("--memory-ceiling")
+    if config.getoption("--memory") or ceiling is not None:
+        from utils.memory import CEILING_MB, MemoryWatchdog
+        config._memory = MemoryWatchdog(CEILING_MB if ceiling is None else ceiling)
+
+
+def pytest_collection_modifyitems(config, items):
+    # Test flaky theo lịch sử: vẫn chạy nhưng fail không làm đỏ run (xfail non-strict)
+    if config.getoption("--no-quarantine"):
+        return
+    rates = flaky.quarantined(flaky.load_history(), config.getoption("--flaky-threshold"))
+    config._quarantined = []
+    for item in items:
+        rate = rates.get(item.nodeid)
+        if rate is not None:
+            item.add_marker(pytest.mark.xfail(reason=f"quarantined: flaky in {rate:.0%} of recent runs", strict=False))
+            config._quarantined.append(item.nodeid)
+
+
+def pytest_unconfigure(config):
+    server = getattr(config, "_standin_server", None)
+    if server:
+        server.stop()
+    if getattr(config, "_lean_sizes", None):
+        config._lean_sizes.save()
+
+
+@pytest.fixture(scope="session")
+def chromedriver_path(request):
+    """
+    Resolve chromedriver một lần cho cả session (cache local, chạy được offline).
+    Đường dẫn được ghim vào CHROMEDRIVER_PATH cho các worker.
+    """
+    from utils.driver_resolver import resolve_chromedriver
+    resolution = resolve_chromedriver(offline=request.config.getoption("--offline"))
+    request.config._driver_resolution = resolution
+    return resolution.path
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    # Screenshot của test fail không lưu được (thread ghi nền không được nuốt lỗi im lặng)
+    for name, error in getattr(config, "_screenshot_errors", ()):
+        terminalreporter.write_line(f"screenshot not saved: {name}: {error}", red=True)
+
+    # In thời gian resolve chromedriver để xác nhận không còn tốn ở từng test
+    resolution = getattr(config, "_driver_resolution", None)
+    if resolution:
+        terminalreporter.write_line(
+            f"chromedriver: {resolution.path} (Chrome {resolution.chrome_version or '?'}, "
+            f"source={resolution.source}, resolved in {resolution.elapsed * 1000:.0f} ms)"
+        )
+
+    # --lean: request / bytes đã tải và phần tiết kiệm được theo từng test
+    usage = getattr(config, "_lean_usage", None)
+    if usage:
+        terminalreporter.write_sep("-", "lean profile: network per test")
+        for nodeid, u in usage.items():
+            unknown = f" +{u.blocked_unknown} unknown" if u.blocked_unknown else ""
+            terminalreporter.write_line(
+                f"{u.requests:4} req {u.bytes / 1024:8.1f} KB | blocked {u.blocked_requests:3} req "
+                f"~{u.blocked_bytes / 1024:7.1f} KB saved{unknown} | {nodeid}"
+            )
+        unknown = sum(u.blocked_unknown for u in usage.values())
+        terminalreporter.write_line(
+            f"total: blocked {sum(u.blocked_requests for u in usage.values())} requests, "
+            f"~{sum(u.blocked_bytes for u in usage.values()) / 1024:.1f} KB saved"
+            + (f", {unknown} of unknown size (run once without --lean to learn them)" if unknown else "")
+        )
+
+    # Test pass nhờ retry tại chỗ, và test đang bị quarantine
+    flaky_now = getattr(config, "_flaky", None)
+    quarantined = getattr(config, "_quarantined", None)
+    if flaky_now or quarantined:
+        terminalreporter.write_sep("-", "flaky tests")
+        for nodeid in flaky_now or ():
+            terminalreporter.write_line(f"passed on retry: {nodeid}")
+        for nodeid in quarantined or ():
+            terminalreporter.write_line(f"quarantined:     {nodeid}")
+
+    # --memory: test để lại nhiều bộ nhớ nhất trong browser, browser bị thay vì vượt ngưỡng
+    watchdog = getattr(config, "_memory", None)
+    if watchdog and (watchdog.retained or watchdog.recycled):
+        terminalreporter.write_sep("-", "browser memory")
+        for nodeid, growth in watchdog.top_retained():
+            if growth > 0:
+                terminalreporter.write_line(f"retained {growth / 1024 / 1024:+8.1f} MB | {nodeid}")
+        for nodeid, footprint in watchdog.recycled:
+            terminalreporter.write_line(f"recycled at {footprint / 1024 / 1024:.0f} MB after {nodeid}")
+
+    # Tổng thời gian chờ, và phần bị mất vào các lần chờ hết timeout
+    waits = getattr(config, "_wait_summary", None)
+    if waits and waits[0]:
+        count, waited, timed_out, lost, polls = waits
+        terminalreporter.write_line(
+            f"waits: {count} waits, {waited:.1f}s total, {polls} polls; "
+            f"{timed_out} timed out ({lost:.1f}s dead time)"
+        )
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, chromedriver_path):
+    """
+    Pool Chrome dùng chung cho cả session.
+    - Khởi động sẵn browser ở background
+    - Teardown session: đóng toàn bộ browser
+    """
+    from utils.browser import create_chrome
+    from utils.driver_pool import DriverPool
+
+    lean = request.config.getoption("--lean")
+    factory = partial(create_chrome, chromedriver_path, lean=lean)
+    pool = DriverPool(
+        factory,
+        size=request.config.getoption("--pool-size"),
+        window_size=lean_profile.WINDOW_SIZE if lean else None,
+    ).start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def screenshot_writer(request):
+    """
+    Thread ghi screenshot chạy nền cho cả session (nén, dedupe theo hash).
+    Worker của utils.parallel không dọn store để tránh xoá ảnh của worker khác.
+    """
+    from utils.screenshots import ScreenshotWriter
+
+    # utils.parallel đặt chung một run id cho mọi worker (dọn theo lần chạy, không theo worker)
+    writer = ScreenshotWriter(
+        SCREENSHOT_DIR, run_id=os.environ.get("PYTEST_RUN_ID") or time.strftime("%Y%m%d-%H%M%S"),
+        worker=os.environ.get("PYTEST_WORKER_ID"),
+        max_width=request.config.getoption("--screenshot-max-width") or None,
+    ).start()
+    yield writer
+    writer.close(prune=not WORKER_DIR)
+    request.config._screenshot_errors = writer.errors
 
 
 @pytest.fixture
-def driver(request):
+def driver(request, driver_pool, screenshot_writer):
     """
-    Fixture tạo Chrome WebDriver cho mỗi test case.
-    - Mở Chrome
-    - Maximize window
-    - implicit wait 5s
-    - Teardown: đóng browser + chụp screenshot nếu test fail
+    Fixture lấy Chrome WebDriver đã khởi động sẵn từ pool cho mỗi test case.
+    - Maximize window, không dùng implicit wait (page object chờ qua utils.waits)
+    - --lean: test có marker `visual` được tải đủ ảnh/font
+    - --memory: đo bộ nhớ trước/sau test, browser vượt ngưỡng bị thay thay vì reset
+    - Teardown: chụp screenshot nếu test fail + reset browser rồi trả về pool
     """
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    driver.maximize_window()
-    driver.implicitly_wait(5)
+    with phase("driver_startup"):
+        driver = driver_pool.acquire()
+
+        watchdog = request.config._memory
+        memory_before = watchdog.before(driver, request.node.nodeid) if watchdog else None
+
+        sizes = request.config._lean_sizes
+        lean = request.config.getoption("--lean")
+        visual = request.node.get_closest_marker("visual") is not None
+        if lean:
+            lean_profile.measure(driver, sizes)   # bỏ log của test trước
+            if visual:
+                lean_profile.set_blocking(driver, False)
+
+    # Retry tại chỗ: đóng tab thừa của lần chạy hỏng
+    flaky.on_retry(request, partial(flaky.close_extra_windows, driver))
 
     yield driver   # trả driver cho test case
 
+    with phase("teardown"):
+        _teardown_driver(request, driver_pool, screenshot_writer, driver, sizes, lean, visual, memory_before)
+
+
+def _teardown_driver(request, driver_pool, screenshot_writer, driver, sizes, lean, visual, memory_before):
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        if lean:
+            usage = lean_profile.measure(driver, sizes)
+            request.config._lean_usage[request.node.nodeid] = usage
+            request.node.user_properties.append(("network", asdict(usage)))
+            if visual:
+                lean_profile.set_blocking(driver, True)
+        else:
+            lean_profile.learn(driver, sizes)   # kích thước thật, cho ước lượng của --lean
+    except WebDriverException:
+        pass   # browser đã hỏng: release() bên dưới sẽ thay browser mới
+
     # --- Teardown sau khi test chạy ---
-    # Nếu test FAIL -> chụp screenshot
+    # Nếu test FAIL -> chụp screenshot (trước khi reset xoá trạng thái trang)
+    # Chỉ lấy bytes PNG; nén + ghi đĩa do thread nền làm
     if hasattr(request.node, "rep_call") and request.node.rep_call.failed:
+        from utils.visual import dynamic_regions
+
         test_name = request.node.name
-        screenshot_path = os.path.join(SCREENSHOT_DIR, f"{test_name}.png")
-        driver.save_screenshot(screenshot_path)
-        print(f"📸 Screenshot saved to: {screenshot_path}")
+        png = driver.get_screenshot_as_png()
+        try:
+            regions = dynamic_regions(driver)   # chart, giờ...: mask khi so visual
+        except WebDriverException:
+            regions = ()
+        screenshot_writer.submit(test_name, png, regions)
+        print(f"📸 Screenshot queued: {test_name} (index: screenshots/runs/{screenshot_writer.index_name}.json)")
+
+    # Bộ nhớ sau test (trước khi reset); vượt ngưỡng -> bỏ browser, pool khởi động browser mới
+    recycle = False
+    watchdog = request.config._memory
+    if watchdog:
+        props, recycle = watchdog.after(driver, request.node.nodeid, memory_before)
+        request.node.user_properties.append(("memory", props))
 
-    driver.quit()  # luôn đóng browser sau mỗi test
+    # Reset cookies/storage/tab/window thay vì đóng browser
+    driver_pool.release(driver, discard=recycle)
+
+
+# --- Hook: bắt đầu đo thời gian theo phase cho từng test ---
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_setup(item):
+    results.start_test()
+    item._perf_mark = perf.RECORDER.mark()
+    yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    # Lỗi tạm thời: chạy lại thân test trên cùng driver (sau các reset của fixture)
+    flaky.wrap_runtest(item, item.config.getoption("--retries"))
+    # Thời gian còn lại của thân test (ngoài wait / thao tác page object...) = body
+    with phase("body"):
+        yield
 
 
 # --- Hook: lưu kết quả test (pass/fail) ---
@@ -44,41 +356,118 @@ def pytest_runtest_makereport(item, call):
     """
     Hook của pytest: lưu kết quả test (setup/call/teardown) vào item.
     Dùng trong fixture driver để biết test pass/fail.
-    Đồng thời log vào file report.txt
+    Sau teardown: ghi kết quả + thời gian theo phase vào bộ nhớ (report.json/report.xml cuối session)
     """
     outcome = yield
     rep = outcome.get_result()
     setattr(item, "rep_" + rep.when, rep)
+    if _is_benchmark(item.nodeid):
+        return
 
     if rep.when == "call":  # chỉ log khi chạy test chính
-        if rep.passed:
-            status = "PASSED"
-        elif rep.failed:
-            status = "FAILED"
-        elif rep.skipped:
-            status = "SKIPPED"
+        print(f"{item.name} → {rep.outcome.upper()}")
+        retries = getattr(item, "_retries", 0)
+        result = flaky.outcome(rep, retries)
+        if result:
+            _outcomes[item.nodeid] = result
+        if retries:
+            item.user_properties.append(("retries", retries))
+
+    if rep.when == "teardown":
+        samples = perf.RECORDER.since(getattr(item, "_perf_mark", 0))
+        if samples:
+            item.user_properties.append(("perf", [asdict(s) for s in samples]))
+        reports = [getattr(item, f"rep_{when}", None) for when in ("setup", "call", "teardown")]
+        reports = [r for r in reports if r is not None]
+        failed = next((r for r in reports if r.failed), None)
+        skipped = next((r for r in reports if r.skipped), None)
+        status = "failed" if failed else "skipped" if skipped else "passed"
+        detail = failed or skipped
+        timer = results.current()
+        _results.add(
+            item.nodeid, item.name, status,
+            duration=sum(r.duration for r in reports),
+            phases=timer.totals if timer else {},
+            message=str(detail.longrepr) if detail else "",
+            properties={k: v for k, v in item.user_properties},
+        )
+
+
+# --- Hook: ghi lại thời gian chạy để chia shard khi chạy song song ---
+def pytest_runtest_logreport(report):
+    if _is_benchmark(report.nodeid):
+        return
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    # Thống kê wait của session + lưu lịch sử để gợi ý timeout (python -m utils.waits)
+    # (utils.waits chưa được import = session không chờ gì, không có gì để ghi)
+    waits = sys.modules.get("utils.waits")
+    if waits:
+        session.config._wait_summary = waits.RECORDER.summary()
+        waits.RECORDER.save_history()
+
+    # --perf: số liệu gộp theo page/action của lần chạy này -> .perf_history.jsonl
+    if WORKER_DIR:
+        perf.RECORDER.save_samples(os.path.join(WORKER_DIR, "perf.json"))
+    else:
+        perf.RECORDER.save()
+
+    # Ghi kết quả một lần, atomic (worker: vào thư mục riêng, utils.parallel gộp lại)
+    if _results.results:
+        if WORKER_DIR:
+            _results.write(os.path.join(WORKER_DIR, "report.json"))
         else:
-            status = "UNKNOWN"
+            _results.write(REPORT_JSON, REPORT_JUNIT)
 
-        test_name = item.name
-        log_line = f"{test_name} → {status}"
-        print(log_line)
+    # Lịch sử flaky (worker: ghi riêng, utils.parallel gộp vào .flaky_history.json)
+    session.config._flaky = [nodeid for nodeid, result in _outcomes.items() if result == flaky.FLAKY]
+    if WORKER_DIR:
+        flaky.record(_outcomes, os.path.join(WORKER_DIR, "flaky.json"))
+    else:
+        flaky.record(_outcomes)
 
-        with open(REPORT_FILE, "a", encoding="utf-8") as f:
-            f.write(log_line + "\n")
+    if not _durations:
+        return
+    if WORKER_DIR:
+        save_durations(_durations, os.path.join(WORKER_DIR, "durations.json"), merge=False)
+    else:
+        save_durations(_durations)
 
 
 # --- Fixture mở trang login ---
 @pytest.fixture
-def open_login_page(driver):
-    driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
+def open_login_page(request, driver_pool, driver):
+    with phase("navigation"):
+        driver.get(settings.LOGIN_URL)
+
+    def reset():
+        # A passed login leaves a session: LOGIN_URL would redirect to the dashboard.
+        # Reset like a pooled driver (cookies, storage, tabs) so the retry starts logged out.
+        driver_pool.reset(driver)
+        driver.get(settings.LOGIN_URL)
+
+    # Retry tại chỗ: browser sạch như driver mới lấy từ pool, mở lại trang login
+    flaky.on_retry(request, reset)
     return driver
 
 
+# --- Fixture session đăng nhập dùng lại cho cả worker ---
+@pytest.fixture(scope="session")
+def auth_session():
+    """
+    Đăng nhập qua UI một lần, sau đó inject cookies/storage cho các driver sau.
+    Tự đăng nhập lại khi session hết hạn.
+    """
+    from utils.auth_session import AuthSession
+    return AuthSession()
+
+
 # --- Fixture dữ liệu hợp lệ ---
 @pytest.fixture
 def valid_credentials():
-    return {"username": "Admin", "password": "admin123"}
+    return {"username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD}
 
 
 # --- Fixture dữ liệu sai username ---
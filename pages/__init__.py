@@ -1,2 +1,32 @@
-from pages.login_page import LoginPage
-from pages.dashboard_page import DashboardPage
\ No newline at end of file
+"""
+Page object registry, loaded lazily (PEP 562).
+
+`import pages` costs nothing; `pages.DashboardPage` imports selenium and the page
+module on first access only, so collection and conftest stay light.
+"""
+import importlib
+
+# class name -> module
+_REGISTRY = {
+    "BasePage": "pages.base_page",
+    "LoginPage": "pages.login_page",
+    "DashboardPage": "pages.dashboard_page",
+    # asyncio variants over utils.cdp (same method names, coroutines)
+    "AsyncLoginPage": "pages.async_pages",
+    "AsyncDashboardPage": "pages.async_pages",
+}
+
+__all__ = list(_REGISTRY)
+
+
+def __getattr__(name):
+    module = _REGISTRY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'pages' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value   # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_REGISTRY))
@@ -0,0 +1,320 @@
+"""
+Page object async (asyncio) trên transport CDP của utils.cdp.
+
+Cùng tên method với LoginPage / DashboardPage, nhưng là coroutine, nên test chuyển dần
+từng chỗ được; các truy vấn độc lập await cùng lúc, một event loop chạy được nhiều browser:
+
+    async with cdp.session(driver) as session:
+        dashboard = AsyncDashboardPage(session)
+        punch, total, charts = await asyncio.gather(
+            dashboard.get_punch_status(), dashboard.get_total_time(), dashboard.get_chart())
+
+- Locator, timeout và script trong trang lấy từ page object đồng bộ tương ứng (SYNC)
+- Mỗi thao tác (chờ element + đọc / click / nhập) là một Runtime.evaluate; chỉ thao tác
+  làm đổi trang (login) mới poll từ Python
+- Method trả element ở bản đồng bộ (get_chart, search_result_items...) trả dữ liệu thuần;
+  method trả danh sách qua Waits.elements trả [] khi hết timeout, như bản đồng bộ
+"""
+import asyncio
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from pages.base_page import FIND_JS, _looks_like_locator
+from pages.dashboard_page import _SNAPSHOT_JS, DashboardPage, DashboardSnapshot
+from pages.login_page import LoginPage
+from utils.cdp import CdpError
+from utils.http_login import REQUIRED, LoginResult
+from utils.waits import _CHILDREN_SETTLED_JS, locator_label
+
+# Wait in the page until the first match of `loc` meets `cond`, then run `action` on it.
+# One round trip per page-object call; {ok: false} once the timeout expires.
+_ACT_JS = FIND_JS + """
+var loc = arguments[0], cond = arguments[1], action = arguments[2], arg = arguments[3], timeout = arguments[4];
+var done = arguments[arguments.length - 1], start = Date.now();
+var visible = function (el) {
+    var r = el.getBoundingClientRect(), s = window.getComputedStyle(el);
+    return (r.width > 0 || r.height > 0) && s.visibility !== 'hidden' && s.display !== 'none';
+};
+var run = function (el, els) {
+    switch (action) {
+        case 'visible': return visible(el);
+        case 'text': return el.innerText.trim();
+        case 'click': el.click(); return true;
+        case 'fill':
+            // Native setter + input event: what v-model listens to
+            var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            el.focus();
+            Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, arg);
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+            return true;
+        case 'texts': return els.map(function (e) { return e.innerText.trim(); });
+        case 'children': return Array.prototype.map.call(el.querySelectorAll(arg), function (e) { return e.innerText.trim(); });
+        case 'shown': return els.map(visible);
+        case 'sizes': return els.map(function (e) { return [e.width || e.clientWidth, e.height || e.clientHeight]; });
+    }
+};
+(function poll() {
+    var els = find(loc), el = els[0];
+    var ok = !!el && (cond === 'present' || (visible(el) && (cond !== 'clickable' || !el.disabled)));
+    if (ok) done({ok: true, value: run(el, els)});
+    else if (Date.now() - start > timeout) done({ok: false});
+    else setTimeout(poll, 50);
+})();
+"""
+
+# Outcome of a login attempt, or null while there is none yet (same rules as LoginPage)
+_LOGIN_OUTCOME_JS = FIND_JS + """
+var url = location.href;
+if (url.indexOf('/auth/login') < 0) return {ok: true, error: null, url: url};
+var shown = function (l) { return find(l).filter(function (el) { return el.offsetParent !== null; }); };
+var error = shown(arguments[0]);
+if (error.length) return {ok: false, error: error[0].innerText.trim(), url: url};
+if (shown(arguments[1]).length) return {ok: false, error: arguments[2], url: url};
+return null;
+"""
+
+# _CHILDREN_SETTLED_JS takes an element: resolve the locator in the page first
+_SETTLED_JS = FIND_JS + "arguments[0] = find(arguments[0])[0];\n" + _CHILDREN_SETTLED_JS
+
+POLL = 0.1
+
+
+class AsyncBasePage:
+    """
+    Base của page object async. Subclass khai báo SYNC = <page object đồng bộ>;
+    locator và timeout được chép từ đó lúc định nghĩa class.
+    """
+
+    SYNC = None
+    DEFAULT_TIMEOUT = 10
+    WAIT_TIMEOUTS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.SYNC is None:
+            return
+        for name in dir(cls.SYNC):
+            value = getattr(cls.SYNC, name)
+            if name.startswith("_") or name in vars(cls):
+                continue
+            if _looks_like_locator(value) or (
+                    isinstance(value, dict) and value and all(_looks_like_locator(v) for v in value.values())):
+                setattr(cls, name, value)
+        cls.DEFAULT_TIMEOUT = cls.SYNC.DEFAULT_TIMEOUT
+        cls.WAIT_TIMEOUTS = cls.SYNC.WAIT_TIMEOUTS
+
+    def __init__(self, session):
+        self.session = session   # utils.cdp.CdpSession of the tab
+
+    # ---- Scripts ----
+    async def script(self, script, *args):
+        return await self.session.call(script, *args)
+
+    async def async_script(self, script, *args):
+        return await self.session.call_async(script, *args)
+
+    async def until(self, script, *args, timeout=None, message=""):
+        # Poll a script from Python until it returns a truthy value; survives navigations
+        # (the script simply runs again in the new document)
+        deadline = time.monotonic() + (timeout or self.DEFAULT_TIMEOUT)
+        while True:
+            try:
+                value = await self.script(script, *args)
+            except CdpError:
+                value = None   # execution context destroyed by a navigation
+            if value:
+                return value
+            if time.monotonic() > deadline:
+                raise TimeoutException(message or "condition not met")
+            await asyncio.sleep(POLL)
+
+    # ---- Element actions ----
+    def _timeout(self, locator):
+        # WAIT_TIMEOUTS holds a timeout or a (timeout, poll) pair; the page polls on its own
+        configured = self.WAIT_TIMEOUTS.get(locator, self.DEFAULT_TIMEOUT)
+        return configured[0] if isinstance(configured, tuple) else configured
+
+    async def _act(self, locator, action, condition="visible", arg=None):
+        timeout = self._timeout(locator)
+        result = await self.async_script(_ACT_JS, list(locator), condition, action, arg, int(timeout * 1000))
+        if not result["ok"]:
+            raise TimeoutException(f"{condition} on {locator_label(locator)} not reached in {timeout}s")
+        return result["value"]
+
+    async def _each(self, locator, action):
+        # `action` over every match, or [] once the timeout expires (like Waits.elements)
+        try:
+            return await self._act(locator, action, condition="present")
+        except TimeoutException:
+            return []
+
+    async def fill(self, locator, text):
+        await self._act(locator, "fill", arg=text)
+
+    async def click(self, locator):
+        await self._act(locator, "click", condition="clickable")
+
+    async def text_of(self, locator):
+        return await self._act(locator, "text")
+
+    async def is_visible(self, locator):
+        return await self._act(locator, "visible")
+
+    # ---- Navigation ----
+    async def open(self, url):
+        await self.session.send("Page.navigate", url=url)
+        await self.until("return document.readyState === 'complete'", message=f"{url} did not load")
+
+
+class AsyncLoginPage(AsyncBasePage):
+    """
+    LoginPage async (xem pages/login_page.py)
+    """
+
+    SYNC = LoginPage
+
+    # =====================
+    # Methods Login
+    # =====================
+    async def enter_username(self, username):
+        await self.fill(self.username_input, username)
+
+    async def enter_password(self, password):
+        await self.fill(self.password_input, password)
+
+    async def click_login(self):
+        await self.click(self.login_button)
+
+    async def attempt_login(self, username, password):
+        """
+        Điền form + submit rồi chờ kết quả (cùng interface với LoginPage.attempt_login)
+        """
+        await asyncio.gather(self.enter_username(username), self.enter_password(password))
+        await self.click_login()
+        raw = await self.until(_LOGIN_OUTCOME_JS, list(self.error_message), list(self.required_message),
+                               REQUIRED, message="No login outcome")
+        return LoginResult(raw["ok"], raw["error"], raw["url"])
+
+    async def get_error_message(self):
+        return await self.text_of(self.error_message)
+
+    # =====================
+    # Methods Forgot Password
+    # =====================
+    async def click_forgot_password(self):
+        await self.click(self.forgot_password_link)
+
+    async def enter_email(self, email):
+        await self.fill(self.email_input, email)
+
+    async def click_reset_password(self):
+        await self.click(self.reset_password_button)
+
+    async def get_reset_success_message(self):
+        return await self.text_of(self.reset_success_message)
+
+    # =====================
+    # Methods UI check
+    # =====================
+    async def is_username_displayed(self):
+        return await self.is_visible(self.username_input)
+
+    async def is_password_displayed(self):
+        return await self.is_visible(self.password_input)
+
+    async def is_login_button_displayed(self):
+        return await self.is_visible(self.login_button)
+
+    async def is_logo_displayed(self):
+        return await self.is_visible(self.logo)
+
+
+class AsyncDashboardPage(AsyncBasePage):
+    """
+    DashboardPage async (xem pages/dashboard_page.py)
+    """
+
+    SYNC = DashboardPage
+
+    # ---- Dashboard Basic Checks ----
+    async def dashboard_loaded(self):
+        return await self.is_visible(self.DASHBOARD_HEADER)
+
+    async def get_title(self):
+        return await self.text_of(self.DASHBOARD_HEADER)
+
+    async def dashboard_logo(self):
+        return await self._act(self.LOGO_HEADER, "visible", condition="present")
+
+    async def dashboard_breadcrumb(self):
+        return await self.text_of(self.BREADCRUMB_HEADER)
+
+    async def layout_visible(self):
+        snap = await self.snapshot()
+        return snap.ready and all(snap.widgets.values())
+
+    # ---- Menu ----
+    async def menu_links(self):
+        await self._act(self.MENU_LINKS, "visible", condition="present")
+        pairs = await self.script(
+            FIND_JS + "return find(arguments[0]).map(function (a) { return [a.textContent.trim(), a.href]; });",
+            list(self.MENU_LINKS))
+        return [tuple(pair) for pair in pairs]
+
+    # ---- Search ----
+    async def search_dashboard(self, keyword: str):
+        await self.fill(self.SEARCH_INPUT, keyword)
+        await self.wait_search_settled()
+
+    async def wait_search_settled(self):
+        # Item count once the oxd-main-menu list has had no mutation for 150 ms
+        timeout = self._timeout(self.SEARCH_RESULT)
+        result = await self.async_script(_SETTLED_JS, list(self.SEARCH_RESULT), "li", 150, int(timeout * 1000))
+        if not result["ok"]:
+            raise TimeoutException(f"children_settled on {locator_label(self.SEARCH_RESULT)} not reached in {timeout}s")
+        return result["items"]
+
+    async def search_result_items(self):
+        # Texts of the menu entries left by the search
+        return await self._act(self.SEARCH_RESULT, "children", condition="present", arg="li")
+
+    # ---- Widget Checks ----
+    async def get_widget_visible(self, name: str):
+        locator = self.WIDGETS.get(name)
+        if not locator:
+            raise ValueError(f"No widget named '{name}'")
+        return await self.is_visible(locator)
+
+    async def get_quick_btn(self):
+        # Visibility of each Quick Launch button
+        return await self._each(self.QUICK_BTN, "shown")
+
+    # ---- Snapshot ----
+    async def snapshot(self, timeout: float = 10, require=None) -> DashboardSnapshot:
+        raw = await self.async_script(_SNAPSHOT_JS, self.SYNC.snapshot_locators(require), int(timeout * 1000))
+        return DashboardSnapshot.from_raw(raw)
+
+    # ---- Title Widgets ----
+    async def get_title_widgets(self):
+        return await self._act(self.TITLE_WIDGETS, "texts", condition="present")
+
+    # ---- Time at Work ----
+    async def get_punch_status(self):
+        return await self._act(self.PUNCH_STATUS, "text", condition="present")
+
+    async def get_total_time(self):
+        return await self._act(self.TOTAL_TIME, "text", condition="present")
+
+    async def get_chart(self):
+        # (width, height) of each chart canvas
+        return [tuple(size) for size in await self._each(self.CHART_CANVAS, "sizes")]
+
+    async def get_btn_time(self):
+        # Visibility of each Time at Work action button
+        return await self._each(self.TIME_BTN, "shown")
+
+    # ---- My Actions ----
+    async def get_my_action_items(self):
+        return await self._each(self.MY_ACTION_ITEMS, "texts")
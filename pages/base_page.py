@@ -0,0 +1,169 @@
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+from utils import perf
+from utils.results import phase
+from utils.waits import Waits
+
+# In-page locator resolution shared by every script that takes (by, value) pairs
+FIND_JS = """
+var find = function (l) {
+    var by = l[0], value = l[1];
+    if (by === 'xpath') {
+        var res = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var out = [];
+        for (var i = 0; i < res.snapshotLength; i++) out.push(res.snapshotItem(i));
+        return out;
+    }
+    if (by === 'class name') return Array.prototype.slice.call(document.getElementsByClassName(value));
+    if (by === 'id') { var el = document.getElementById(value); return el ? [el] : []; }
+    if (by === 'name') return Array.prototype.slice.call(document.getElementsByName(value));
+    if (by === 'tag name') return Array.prototype.slice.call(document.getElementsByTagName(value));
+    return Array.prototype.slice.call(document.querySelectorAll(value));
+};
+"""
+
+# Resolve several locators in one round trip: first match of each, or null
+_FIND_FIRST_JS = FIND_JS + """
+return arguments[0].map(function (l) { var els = find(l); return els.length ? els[0] : null; });
+"""
+
+# Cache hits are re-checked on the element itself when a stricter condition is asked for
+_STRICTNESS = {"present": 0, "visible": 1, "clickable": 2}
+_ON_ELEMENT = {
+    "visible": lambda el: el.is_displayed(),
+    "clickable": lambda el: el.is_displayed() and el.is_enabled(),
+}
+
+_STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+
+
+def _looks_like_locator(value):
+    return isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str)
+
+
+def validate_locator(name, locator):
+    # Cheap structural checks, run once when the page class is defined
+    by, value = locator
+    if by not in _STRATEGIES:
+        raise ValueError(f"{name}: unknown locator strategy {by!r}")
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{name}: empty locator value")
+    if by in (By.XPATH, By.CSS_SELECTOR):
+        for open_, close in ("[]", "()"):
+            if value.count(open_) != value.count(close):
+                raise ValueError(f"{name}: unbalanced {open_}{close} in {value!r}")
+        for quote in ("'", '"'):
+            if value.count(quote) % 2:
+                raise ValueError(f"{name}: unbalanced {quote} in {value!r}")
+    if by == By.CLASS_NAME and " " in value.strip():
+        raise ValueError(f"{name}: compound class names are not allowed in {value!r}")
+
+
+class BasePage:
+    """
+    Base của mọi page object.
+
+    - Locator khai báo một lần ở class, được kiểm tra khi import (__init_subclass__)
+    - Element đã tìm được cache theo page instance
+    - Cache tự bỏ khi điều hướng (open/back) hoặc gặp StaleElementReferenceException
+    """
+
+    DEFAULT_TIMEOUT = 10
+    WAIT_TIMEOUTS = {}
+
+    # name -> locator, filled for each subclass at import time
+    LOCATORS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        locators = dict(getattr(cls, "LOCATORS", {}))
+        for name, value in vars(cls).items():
+            if name.startswith("_"):
+                continue
+            if _looks_like_locator(value):
+                validate_locator(f"{cls.__name__}.{name}", value)
+                locators[name] = value
+            elif isinstance(value, dict) and value and all(_looks_like_locator(v) for v in value.values()):
+                for key, loc in value.items():
+                    validate_locator(f"{cls.__name__}.{name}[{key!r}]", loc)
+                    locators[f"{name}.{key}"] = loc
+        cls.LOCATORS = locators
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.wait = Waits(driver, self.DEFAULT_TIMEOUT, timeouts=self.WAIT_TIMEOUTS)
+        self._elements = {}
+
+    # ---- Element cache ----
+    def element(self, locator, condition="visible"):
+        # Cached element for `locator`; waits (visible / clickable / present) on a miss, or
+        # on a hit cached under a weaker condition (e.g. prefetched = present, now clickable)
+        cached = self._elements.get(locator)
+        if cached is None:
+            el = getattr(self.wait, condition)(locator)
+            self._elements[locator] = (el, condition)
+            return el
+        el, met = cached
+        if _STRICTNESS[condition] > _STRICTNESS[met]:
+            check = _ON_ELEMENT[condition]
+            self.wait.until(lambda d: check(el), f"{condition} on cached element not reached",
+                            kind=condition, locator=locator)
+            self._elements[locator] = (el, condition)
+        return el
+
+    def prefetch(self, *locators):
+        # Resolve several locators with a single script call and cache the hits (as "present")
+        missing = [loc for loc in locators if loc not in self._elements]
+        if missing:
+            with phase("interactions"):
+                found = self.driver.execute_script(_FIND_FIRST_JS, [list(loc) for loc in missing])
+            for loc, el in zip(missing, found):
+                if el is not None:
+                    self._elements[loc] = (el, "present")
+
+    def act(self, locator, action, condition="visible"):
+        # Run action(element); on a stale handle re-locate once and retry
+        with phase("interactions"):
+            try:
+                return action(self.element(locator, condition))
+            except StaleElementReferenceException:
+                self.invalidate()
+                return action(self.element(locator, condition))
+
+    def fill(self, locator, text):
+        # Clear an input and type `text` into it
+        def _fill(field):
+            field.clear()
+            field.send_keys(text)
+        self.act(locator, _fill)
+
+    def click(self, locator):
+        self.act(locator, lambda el: el.click(), condition="clickable")
+
+    def text_of(self, locator):
+        return self.act(locator, lambda el: el.text)
+
+    def is_visible(self, locator):
+        return self.act(locator, lambda el: el.is_displayed())
+
+    def invalidate(self, locator=None):
+        # Drop one cached element, or all of them (navigation)
+        if locator is None:
+            self._elements.clear()
+        else:
+            self._elements.pop(locator, None)
+
+    # ---- Application performance (pytest --perf) ----
+    def capture_perf(self, action):
+        # Navigation / Resource Timing + long tasks since the last capture on this document
+        return perf.RECORDER.capture(self.driver, type(self).__name__, action)
+
+    # ---- Navigation ----
+    def open(self, url):
+        self.driver.get(url)
+        self.invalidate()
+
+    def back(self):
+        self.driver.back()
+        self.invalidate()
@@ -1,8 +1,153 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
-class DashboardPage:
+from pages.base_page import BasePage, FIND_JS
+from utils.results import phase
+
+# Collect the whole dashboard state in the page, in one WebDriver round trip.
+# Polls in-page until every widget title has rendered, no loading spinner is left in the
+# widget grid and every required widget body (filled by XHR after the titles) has content;
+# ready=false if that is still not the case when the timeout expires.
+_SNAPSHOT_JS = FIND_JS + """
+var loc = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var visible = function (el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+};
+var text = function (l) { var els = find(l); return els.length ? els[0].textContent.trim() : null; };
+var collect = function () {
+    var widgets = {};
+    Object.keys(loc.widgets).forEach(function (name) {
+        var els = find(loc.widgets[name]);
+        widgets[name] = els.length > 0 && visible(els[0]);
+    });
+    return {
+        widgets: widgets,
+        titles: find(loc.titles).map(function (el) { return el.textContent; }),
+        quick_launch: find(loc.quick).map(visible),
+        my_actions: find(loc.actions).map(function (el) { return [el.textContent.trim(), visible(el)]; }),
+        time_buttons: find(loc.time_btn).map(visible),
+        punch_status: text(loc.punch),
+        total_time: text(loc.total),
+        chart_canvases: find(loc.chart).length,
+        breadcrumb: text(loc.breadcrumb)
+    };
+};
+var TEXT_BODIES = ['punch', 'total'];
+var filled = function (key) {
+    var els = find(loc[key]);
+    return els.length > 0 && (TEXT_BODIES.indexOf(key) < 0 || els[0].textContent.trim() !== '');
+};
+var start = Date.now();
+(function poll() {
+    var ready = Object.keys(loc.widgets).every(function (name) { return find(loc.widgets[name]).length > 0; })
+        && !find(loc.spinner).some(visible)
+        && loc.require.every(filled);
+    if (ready || Date.now() - start > timeout) { var snap = collect(); snap.ready = ready; done(snap); }
+    else setTimeout(poll, 100);
+})();
+"""
+
+# Click each matching element with navigation intercepted (Navigation API + window.open)
+# and return the URL each one would have loaded, or null; the dashboard never unloads.
+_TARGETS_JS = FIND_JS + """
+var els = find(arguments[0]), wait = arguments[1], done = arguments[arguments.length - 1];
+if (!window.navigation) { done(null); return; }
+var targets = [], current = -1, open = window.open;
+var record = function (url) {
+    if (current >= 0 && targets[current] === null) targets[current] = new URL(url, location.href).href;
+};
+var onNavigate = function (e) { record(e.destination.url); if (e.cancelable) e.preventDefault(); };
+navigation.addEventListener('navigate', onNavigate);
+window.open = function (url) { record(url); return null; };
+var i = 0;
+(function next() {
+    if (i >= els.length) {
+        navigation.removeEventListener('navigate', onNavigate);
+        window.open = open;
+        done(targets);
+        return;
+    }
+    current = i; targets[i] = null; els[i].click();
+    var start = Date.now();
+    (function poll() {
+        if (targets[i] !== null || Date.now() - start > wait) { i++; next(); }
+        else setTimeout(poll, 20);
+    })();
+})();
+"""
+
+# In a destination tab: wait for the load and the page header, report where we ended up
+_LANDED_JS = FIND_JS + """
+var header = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var start = Date.now();
+(function poll() {
+    var els = document.readyState === 'complete' ? find(header) : [];
+    if (els.length || Date.now() - start > timeout)
+        done({url: location.href, header: els.length ? els[0].textContent.trim() : null});
+    else setTimeout(poll, 100);
+})();
+"""
+
+
+@dataclass(frozen=True)
+class TargetCheck:
+    # Where one widget button leads, checked by DashboardPage.verify_targets()
+    index: int
+    target: Optional[str]                # URL the click asked for (None: not interceptable)
+    landed: str                          # URL after the load
+    header: Optional[str]                # module header of the destination page
+    tab: bool                            # checked in a parallel tab (False: click + back fallback)
+
+    @property
+    def ok(self):
+        return self.header is not None and "/auth/login" not in self.landed
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    # Immutable view of the dashboard taken by DashboardPage.snapshot()
+    ready: bool                          # titles + required widget bodies rendered, no spinner, before the timeout
+    widgets: Mapping[str, bool]          # WIDGETS name -> visible
+    titles: Tuple[str, ...]
+    quick_launch: Tuple[bool, ...]       # visibility of each Quick Launch button
+    my_actions: Tuple[Tuple[str, bool], ...]   # (text, visible) of each My Actions item
+    time_buttons: Tuple[bool, ...]       # visibility of each Time at Work action button
+    punch_status: Optional[str]
+    total_time: Optional[str]
+    chart_canvases: int
+    breadcrumb: Optional[str]
+
+    @classmethod
+    def from_raw(cls, raw):
+        # Build from the result of _SNAPSHOT_JS
+        return cls(
+            ready=raw["ready"],
+            widgets=MappingProxyType(dict(raw["widgets"])),
+            titles=tuple(raw["titles"]),
+            quick_launch=tuple(raw["quick_launch"]),
+            my_actions=tuple((text, shown) for text, shown in raw["my_actions"]),
+            time_buttons=tuple(raw["time_buttons"]),
+            punch_status=raw["punch_status"],
+            total_time=raw["total_time"],
+            chart_canvases=raw["chart_canvases"],
+            breadcrumb=raw["breadcrumb"],
+        )
+
+    @property
+    def quick_launch_count(self):
+        return len(self.quick_launch)
+
+    @property
+    def my_actions_count(self):
+        return len(self.my_actions)
+
+
+class DashboardPage(BasePage):
     # ---- Locators ----
     DASHBOARD_HEADER = (By.XPATH, "//h6[text()='Dashboard']")
     LOGO_HEADER = (By.CLASS_NAME, "oxd-brand")
@@ -32,48 +177,81 @@ class DashboardPage:
     PUNCH_STATUS = (By.CSS_SELECTOR, ".orangehrm-attendance-card-profile-record .orangehrm-attendance-card-details")
     TOTAL_TIME = (By.CSS_SELECTOR, ".orangehrm-attendance-card-bar .orangehrm-attendance-card-fulltime")
     CHART_CANVAS = (By.CSS_SELECTOR, ".emp-attendance-chart canvas")
-    
-    # ---- Constructor ----
-    def __init__(self, driver):
-        self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+    WIDGET_SPINNER = (By.CSS_SELECTOR, ".orangehrm-dashboard-grid .oxd-loading-spinner")
+
+    # Areas that change between runs; masked in visual diffs (utils.visual.element_regions)
+    DYNAMIC_REGIONS = (CHART_CANVAS, TOTAL_TIME, PUNCH_STATUS)
+
+    # Menu
+    SIDEPANEL = (By.CLASS_NAME, "oxd-sidepanel")
+    MENU_TOGGLE = (By.CLASS_NAME, "oxd-main-menu-button")
+    MENU_LINKS = (By.CSS_SELECTOR, "ul.oxd-main-menu a.oxd-main-menu-item")
+
+    # Per-locator (timeout, poll) for lookups that may legitimately find nothing
+    WAIT_TIMEOUTS = {
+        QUICK_BTN: (5, 0.25),
+        MY_ACTION_ITEMS: (5, 0.25),
+        TIME_BTN: (5, 0.25),
+        CHART_CANVAS: (5, 0.25),
+        LOGO_HEADER: (5, 0.25),
+    }
 
     # ---- Dashboard Basic Checks ----
     def dashboard_loaded(self):
         # Wait until dashboard header is visible
-        return self.wait.until(EC.visibility_of_element_located(self.DASHBOARD_HEADER)).is_displayed()
+        return self.is_visible(self.DASHBOARD_HEADER)
 
     def get_title(self):
         # Return the dashboard page title text
-        return self.wait.until(EC.visibility_of_element_located(self.DASHBOARD_HEADER)).text
+        return self.text_of(self.DASHBOARD_HEADER)
 
     def dashboard_logo(self):
         # Check if logo is displayed
-        element = self.driver.find_element(*self.LOGO_HEADER)
-        return element.is_displayed()
+        return self.act(self.LOGO_HEADER, lambda el: el.is_displayed(), condition="present")
 
     def dashboard_breadcrumb(self):
         # Return breadcrumb text
-        return self.wait.until(EC.visibility_of_element_located(self.BREADCRUMB_HEADER)).text
+        return self.text_of(self.BREADCRUMB_HEADER)
+
+    def layout_visible(self):
+        # True when every widget rendered and is visible (no broken layout)
+        snap = self.snapshot()
+        return snap.ready and all(snap.widgets.values())
 
     # ---- Menu ----
     def verify_menu(self):
         # Return menu panel and toggle button
-        menu = self.driver.find_element(By.CLASS_NAME,"oxd-sidepanel")
-        toggle_btn = self.driver.find_element(By.CLASS_NAME, "oxd-main-menu-button")
+        menu = self.element(self.SIDEPANEL, condition="present")
+        toggle_btn = self.element(self.MENU_TOGGLE, condition="clickable")
         return menu, toggle_btn
 
+    def menu_links(self):
+        # (module name, absolute URL) of every sidebar entry, in menu order, in one round trip
+        links = self.wait.elements(self.MENU_LINKS)
+        with phase("interactions"):
+            pairs = self.driver.execute_script(
+                "return arguments[0].map(function (a) { return [a.textContent.trim(), a.href]; });", links)
+        return [tuple(pair) for pair in pairs]
+
+    def wait_menu_toggled(self, toggled: bool = True):
+        # Wait (MutationObserver) until the sidepanel gains / loses the 'toggled' class
+        self.wait.class_toggled(self.SIDEPANEL, "toggled", present=toggled)
+
     # ---- Search ----
     def search_dashboard(self, keyword: str):
         # Enter keyword in search input
-        search_input = self.wait.until(EC.visibility_of_element_located(self.SEARCH_INPUT))
-        search_input.clear()
-        search_input.send_keys(keyword)
+        self.fill(self.SEARCH_INPUT, keyword)
+        # Wait until the filtered menu stops changing instead of sleeping
+        self.wait_search_settled()
+        self.capture_perf("search")
+
+    def wait_search_settled(self):
+        # Return the menu item count once the oxd-main-menu list is stable
+        return self.wait.children_settled(self.SEARCH_RESULT, "li")
 
     def search_result_items(self):
         # Return all li items in search result
-        result = self.wait.until(EC.presence_of_element_located(self.SEARCH_RESULT))
-        return result.find_elements(By.TAG_NAME, "li")
+        return self.act(self.SEARCH_RESULT, lambda ul: ul.find_elements(By.TAG_NAME, "li"), condition="present")
 
     # ---- Widget Checks ----
     def get_widget_visible(self, name: str):
@@ -81,13 +259,19 @@ class DashboardPage:
         locator = self.WIDGETS.get(name)
         if not locator:
             raise ValueError(f"No widget named '{name}'")
-        element = self.wait.until(EC.visibility_of_element_located(locator))
-        return element.is_displayed()
+        return self.is_visible(locator)
+
+    # Buttons whose destinations verify_targets() checks
+    WIDGET_BUTTONS = {
+        "quick_launch": QUICK_BTN,
+        "time_at_work": TIME_BTN,
+        "my_actions": MY_ACTION_ITEMS,
+    }
 
     # ---- Quick Launch ----
     def get_quick_btn(self):
         # Return all quick launch buttons
-        return self.driver.find_elements(*self.QUICK_BTN)
+        return self.wait.elements(self.QUICK_BTN)
 
     def click_btn_widgets(self, index: int):
         # Click a specific Quick Launch button by index
@@ -96,35 +280,135 @@ class DashboardPage:
             raise ValueError("Quick Launch index out of range")
         btn_widgets[index].click()
 
+    # ---- Snapshot ----
+    # Widget name -> snapshot keys of its body, loaded by XHR after the widget title
+    WIDGET_BODIES = {
+        "quick_launch": ("quick",),
+        "my_actions": ("actions",),
+        "time_at_work": ("punch", "total", "chart"),
+    }
+
+    @classmethod
+    def snapshot_locators(cls, require=None):
+        # Argument of _SNAPSHOT_JS (shared with AsyncDashboardPage); `require`: widget names
+        # whose bodies must have rendered (default: all of WIDGET_BODIES)
+        names = cls.WIDGET_BODIES if require is None else require
+        return {
+            "require": [key for name in names for key in cls.WIDGET_BODIES[name]],
+            "spinner": cls.WIDGET_SPINNER,
+            "widgets": {name: list(loc) for name, loc in cls.WIDGETS.items()},
+            "titles": cls.TITLE_WIDGETS,
+            "quick": cls.QUICK_BTN,
+            "actions": cls.MY_ACTION_ITEMS,
+            "time_btn": cls.TIME_BTN,
+            "punch": cls.PUNCH_STATUS,
+            "total": cls.TOTAL_TIME,
+            "chart": cls.CHART_CANVAS,
+            "breadcrumb": cls.BREADCRUMB_HEADER,
+        }
+
+    def snapshot(self, timeout: float = 10, require=None) -> DashboardSnapshot:
+        # Whole dashboard state (widgets, counts, texts) in a single script execution;
+        # require=("time_at_work",) waits only for the bodies the caller reads
+        with phase("interactions"):
+            raw = self.driver.execute_async_script(_SNAPSHOT_JS, self.snapshot_locators(require), int(timeout * 1000))
+        return DashboardSnapshot.from_raw(raw)
+
+    # ---- Widget Targets ----
+    def collect_targets(self, locator, wait: float = 0.5):
+        # URL behind each matching element (None where the click did not navigate)
+        with phase("interactions"):
+            return self.driver.execute_async_script(_TARGETS_JS, list(locator), int(wait * 1000))
+
+    def verify_targets(self, name: str, timeout: float = 15):
+        """
+        Check where every button of a widget leads without reloading the dashboard:
+        collect the targets once, open them all in parallel tabs of this browser
+        (same session), check each tab, close it. Buttons whose target could not be
+        intercepted fall back to click + back.
+        """
+        locator = self.WIDGET_BUTTONS.get(name)
+        if not locator:
+            raise ValueError(f"No widget buttons named '{name}'")
+        targets = self.collect_targets(locator) or [None] * len(self.wait.elements(locator))
+
+        checks = {}
+        opened = {i: url for i, url in enumerate(targets) if url}
+        if opened:
+            checks.update(self._check_in_tabs(opened, timeout))
+        for i, url in enumerate(targets):
+            if i not in checks:
+                checks[i] = self._check_by_click(locator, i, url, timeout)
+        return [checks[i] for i in range(len(targets))]
+
+    def _check_in_tabs(self, targets, timeout):
+        # All tabs start loading at once; checking them one by one afterwards is mostly waiting on the slowest
+        home = self.driver.current_window_handle
+        tabs = {}
+        with phase("navigation"):
+            for i, url in targets.items():
+                # Window names are not handles in every driver: diff the handle list instead
+                before = set(self.driver.window_handles)
+                self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+                opened = [h for h in self.driver.window_handles if h not in before]
+                if opened:
+                    tabs[i] = opened[0]   # blocked popup: left to the click fallback
+        checks = {}
+        try:
+            for i, handle in tabs.items():
+                self.driver.switch_to.window(handle)
+                with phase("navigation"):
+                    landed = self.driver.execute_async_script(
+                        _LANDED_JS, list(self.BREADCRUMB_HEADER), int(timeout * 1000))
+                checks[i] = TargetCheck(i, targets[i], landed["url"], landed["header"], tab=True)
+                self.driver.close()
+        finally:
+            for i, handle in tabs.items():
+                if i not in checks and handle in self.driver.window_handles:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(home)
+        return checks
+
+    def _check_by_click(self, locator, index, target, timeout):
+        # Fallback: navigate away and come back (reloads the dashboard)
+        home = self.driver.current_url
+        self.wait.elements(locator)[index].click()
+        self.invalidate()
+        with phase("navigation"):
+            self.wait.until(lambda d: d.current_url != home)
+            landed = self.driver.execute_async_script(
+                _LANDED_JS, list(self.BREADCRUMB_HEADER), int(timeout * 1000))
+        self.back()
+        return TargetCheck(index, target, landed["url"], landed["header"], tab=False)
+
     # ---- Title Widgets ----
     def get_title_widgets(self):
         # Return list of all widget titles
-        elements = self.wait.until(EC.presence_of_all_elements_located(self.TITLE_WIDGETS))
+        elements = self.wait.all_present(self.TITLE_WIDGETS)
         return [el.text for el in elements]
 
     # ---- Time at Work ----
     def get_punch_status(self):
         # Return Punch In/Out status text
-        stt = self.driver.find_element(*self.PUNCH_STATUS)
-        return stt.text
+        return self.act(self.PUNCH_STATUS, lambda el: el.text, condition="present")
     
     def get_total_time(self):
         # Return total work time text
-        total = self.driver.find_element(*self.TOTAL_TIME)
-        return total.text.strip()
+        return self.act(self.TOTAL_TIME, lambda el: el.text.strip(), condition="present")
     
     def get_chart(self):
         # Return all chart canvas elements
-        return self.driver.find_elements(*self.CHART_CANVAS)
+        return self.wait.elements(self.CHART_CANVAS)
 
     def get_btn_time(self):
         # Return all Time at Work action buttons
-        return self.driver.find_elements(*self.TIME_BTN)
+        return self.wait.elements(self.TIME_BTN)
 
     # ---- My Actions ----
     def get_my_action_items(self):
         # Return all My Actions items
-        return self.driver.find_elements(*self.MY_ACTION_ITEMS)
+        return self.wait.elements(self.MY_ACTION_ITEMS)
 
     # ---- Generic Click Helper ----
     def click_all_visible_btn(self, elements):
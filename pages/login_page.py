@@ -1,9 +1,11 @@
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
+from pages.base_page import BasePage
+from utils.http_login import REQUIRED, LoginResult
 
-class LoginPage:
+
+class LoginPage(BasePage):
     """
     Page Object Model cho trang login OrangeHRM
     Bao gồm:
@@ -12,29 +14,37 @@ class LoginPage:
     - Kiểm tra UI
     """
 
-    def __init__(self, driver):
-        self.driver = driver
-
-        # =====================
-        # Locators cho Login
-        # =====================
-        self.username_input = (By.NAME, "username")               # Ô nhập Username
-        self.password_input = (By.NAME, "password")               # Ô nhập Password
-        self.login_button = (By.XPATH, "//button[@type='submit']") # Nút Login
-        self.error_message = (By.XPATH, "//p[contains(@class,'oxd-alert-content-text')]") # Thông báo lỗi
-
-        # =====================
-        # Locators cho Forgot Password
-        # =====================
-        self.forgot_password_link = (By.XPATH, "//p[contains(text(),'Forgot your password?')]")  # Link Forgot
-        self.email_input = (By.NAME, "email")                 # Ô nhập email
-        self.reset_password_button = (By.XPATH, "//button[text()='Reset Password']")  # Nút Reset
-        self.reset_success_message = (By.XPATH, "//p[contains(text(),'successfully')]")  # Thông báo thành công
-
-        # =====================
-        # Locator cho logo UI check
-        # =====================
-        self.logo = (By.CSS_SELECTOR, "div.orangehrm-login-branding img")
+    # =====================
+    # Locators cho Login
+    # =====================
+    username_input = (By.NAME, "username")               # Ô nhập Username
+    password_input = (By.NAME, "password")               # Ô nhập Password
+    login_button = (By.XPATH, "//button[@type='submit']") # Nút Login
+    error_message = (By.XPATH, "//p[contains(@class,'oxd-alert-content-text')]") # Thông báo lỗi
+    required_message = (By.XPATH, "//span[text()='Required']")  # Lỗi validate field trống
+
+    # =====================
+    # Locators cho Forgot Password
+    # =====================
+    forgot_password_link = (By.XPATH, "//p[contains(text(),'Forgot your password?')]")  # Link Forgot
+    email_input = (By.NAME, "email")                 # Ô nhập email
+    reset_password_button = (By.XPATH, "//button[text()='Reset Password']")  # Nút Reset
+    reset_success_message = (By.XPATH, "//p[contains(text(),'successfully')]")  # Thông báo thành công
+
+    # =====================
+    # Locator cho logo UI check
+    # =====================
+    logo = (By.CSS_SELECTOR, "div.orangehrm-login-branding img")
+
+    # =====================
+    # Wait: mặc định 10s, các field login / link Forgot chờ 15s
+    # =====================
+    WAIT_TIMEOUTS = {
+        username_input: 15,
+        password_input: 15,
+        login_button: 15,
+        forgot_password_link: 15,
+    }
 
     # =====================
     # Methods Login
@@ -42,38 +52,57 @@ class LoginPage:
     def enter_username(self, username):
         """
         Nhập username vào ô input
+        (tìm luôn ô password + nút login trong cùng một lần gọi script)
         """
-        field = WebDriverWait(self.driver, 15).until(
-            EC.visibility_of_element_located(self.username_input)
-        )
-        field.clear()
-        field.send_keys(username)
+        self.element(self.username_input)
+        self.prefetch(self.password_input, self.login_button)
+        self.fill(self.username_input, username)
 
     def enter_password(self, password):
         """
         Nhập password vào ô input
         """
-        field = WebDriverWait(self.driver, 15).until(
-            EC.visibility_of_element_located(self.password_input)
-        )
-        field.clear()
-        field.send_keys(password)
+        self.fill(self.password_input, password)
 
     def click_login(self):
         """
         Click nút login khi có thể click được
-        """
-        WebDriverWait(self.driver, 15).until(
-            EC.element_to_be_clickable(self.login_button)
-        ).click()
+        (đo trang login trước khi submit; submit chuyển trang -> bỏ cache element)
+        """
+        self.capture_perf("load")
+        self.click(self.login_button)
+        self.invalidate()
+
+    def attempt_login(self, username, password):
+        """
+        Điền form + submit rồi chờ kết quả: rời trang login, thông báo lỗi hoặc "Required"
+        (cùng interface với utils.http_login.HttpLoginClient)
+        """
+        self.enter_username(username)
+        self.enter_password(password)
+        self.click_login()
+        return self.wait.until(self._login_outcome, "No login outcome", label="login outcome")
+
+    def _login_outcome(self, driver):
+        # LoginResult once the attempt has an outcome, else False (keep waiting)
+        url = driver.current_url
+        if "/auth/login" not in url:
+            return LoginResult(True, None, url)
+        for locator in (self.error_message, self.required_message):
+            try:
+                shown = [el for el in driver.find_elements(*locator) if el.is_displayed()]
+            except StaleElementReferenceException:
+                return False   # page re-rendering: look again on the next poll
+            if shown:
+                error = REQUIRED if locator is self.required_message else shown[0].text
+                return LoginResult(False, error, url)
+        return False
 
     def get_error_message(self):
         """
         Lấy text thông báo lỗi khi login thất bại
         """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.error_message)
-        ).text
+        return self.text_of(self.error_message)
 
     # =====================
     # Methods Forgot Password
@@ -82,35 +111,25 @@ class LoginPage:
         """
         Click link 'Forgot your password?'
         """
-        WebDriverWait(self.driver, 15).until(
-            EC.element_to_be_clickable(self.forgot_password_link)
-        ).click()
+        self.click(self.forgot_password_link)
 
     def enter_email(self, email):
         """
         Nhập email để reset password
         """
-        field = WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.email_input)
-        )
-        field.clear()
-        field.send_keys(email)
+        self.fill(self.email_input, email)
 
     def click_reset_password(self):
         """
         Click nút Reset Password
         """
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(self.reset_password_button)
-        ).click()
+        self.click(self.reset_password_button)
 
     def get_reset_success_message(self):
         """
         Lấy thông báo thành công reset password
         """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.reset_success_message)
-        ).text
+        return self.text_of(self.reset_success_message)
 
     # =====================
     # Methods UI check
@@ -119,30 +138,22 @@ class LoginPage:
         """
         Kiểm tra username field có hiển thị không
         """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.username_input)
-        ).is_displayed()
+        return self.is_visible(self.username_input)
 
     def is_password_displayed(self):
         """
         Kiểm tra password field có hiển thị không
         """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.password_input)
-        ).is_displayed()
+        return self.is_visible(self.password_input)
 
     def is_login_button_displayed(self):
         """
         Kiểm tra login button có hiển thị không
         """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.login_button)
-        ).is_displayed()
+        return self.is_visible(self.login_button)
 
     def is_logo_displayed(self):
         """
         Kiểm tra logo có hiển thị không
         """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(self.logo)
-        ).is_displayed()
\ No newline at end of file
+        return self.is_visible(self.logo)
@@ -1,2 +0,0 @@
-from tests.test_login import LoginPage
-from tests.test_dashboard import DashboardPage
\ No newline at end of file
@@ -0,0 +1,102 @@
+import fnmatch
+import json
+from urllib.parse import urlsplit
+
+import pytest
+
+from utils import config, lean
+
+COOKIES = [{"name": "orangehrm", "value": "abc", "domain": urlsplit(config.BASE_URL).hostname, "path": "/"}]
+STORAGE = {"local": {"theme": "dark"}, "session": {"tab": "1"}}
+
+
+class LeanBrowser:
+    """
+    Chromium stand-in (no browser needed): honours Network.setBlockedURLs like Chrome
+    (a blocked document becomes a chrome-error page where scripts fail) and runs the
+    scripts registered with Page.addScriptToEvaluateOnNewDocument on every load.
+    """
+
+    def __init__(self):
+        self.blocked = []
+        self.cookies = []
+        self.storage = {"local": {}, "session": {}}
+        self.on_new_document = {}
+        self.visited = []
+        self.current_url = "about:blank"
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.setBlockedURLs":
+            self.blocked = params["urls"]
+        elif cmd == "Network.setCookie":
+            self.cookies.append(params)
+        elif cmd == "Page.addScriptToEvaluateOnNewDocument":
+            identifier = str(len(self.on_new_document) + 1)
+            self.on_new_document[identifier] = params["source"]
+            return {"identifier": identifier}
+        elif cmd == "Page.removeScriptToEvaluateOnNewDocument":
+            del self.on_new_document[params["identifier"]]
+        return {}
+
+    def get(self, url):
+        self.visited.append(url)
+        if any(fnmatch.fnmatch(url, pattern) for pattern in self.blocked):
+            self.current_url = "chrome-error://chromewebdata/"
+            return
+        self.current_url = url
+        for source in self.on_new_document.values():
+            self._run_restore(source)
+
+    def _run_restore(self, source):
+        # The registered restore is `(function (data, origin) {...})(<data>, <origin>);`
+        args = source[source.rindex("})(") + 3:].rstrip().rstrip(";").rstrip(")")
+        decoder = json.JSONDecoder()
+        data, end = decoder.raw_decode(args)
+        origin, _ = decoder.raw_decode(args[end:].lstrip(", "))
+        parts = urlsplit(self.current_url)
+        if f"{parts.scheme}://{parts.netloc}" == origin:
+            for kind in ("local", "session"):
+                self.storage[kind].update(data[kind])
+
+    def execute_script(self, script, *args):
+        if self.current_url.startswith("chrome-error://"):
+            from selenium.common.exceptions import JavascriptException
+
+            raise JavascriptException("javascript error: Cannot access 'localStorage' on an error page")
+        if "setItem" in script:
+            for kind in ("local", "session"):
+                self.storage[kind].update(args[0][kind])
+
+
+class TestAuthSessionRestore:
+
+    @pytest.fixture
+    def browser(self):
+        browser = LeanBrowser()
+        lean.set_blocking(browser)
+        return browser
+
+    @pytest.fixture
+    def session(self):
+        # Imported here: utils.auth_session pulls in selenium, collection must not
+        from utils.auth_session import AuthSession
+
+        return AuthSession()
+
+    def test_restore_under_lean_blocklist(self, browser, session):
+        assert session._restore(browser, COOKIES, STORAGE)
+
+        assert browser.storage == STORAGE
+        assert browser.current_url == config.DASHBOARD_URL
+        assert not any(fnmatch.fnmatch(url, p) for url in browser.visited for p in lean.BLOCKED_URLS), browser.visited
+
+    def test_restore_script_is_only_for_that_load(self, browser, session):
+        session._restore(browser, COOKIES, STORAGE)
+
+        assert browser.on_new_document == {}, "storage would be reset on every later navigation"
+
+    def test_restore_without_storage_loads_dashboard_only(self, browser, session):
+        assert session._restore(browser, COOKIES, {"local": {}, "session": {}})
+
+        assert browser.visited == [config.DASHBOARD_URL]
+        assert browser.cookies and browser.cookies[0]["name"] == "orangehrm"
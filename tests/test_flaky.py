@@ -0,0 +1,42 @@
+import pytest
+
+from utils import flaky
+from utils.flaky import FAIL, FLAKY, PASS
+
+# ---- Flake rate (no browser needed) ----
+# runs (oldest first) -> expected rate with MIN_RUNS = 5
+RATES = [
+    ([PASS] * 10, 0.0),
+    ([PASS, FLAKY, PASS, PASS, PASS], 0.2),
+    ([PASS, FAIL, PASS, FLAKY], 0.5),
+    ([FAIL] * 6, 0.0),                      # never passes: broken, not flaky
+    ([PASS] + [FAIL] * 5, 0.0),             # failed every recent run: broken since
+    ([FAIL] * 4 + [PASS], 0.8),
+    ([FLAKY] * 3, 1.0),
+    ([], 0.0),
+]
+
+# history -> nodeids quarantined at THRESHOLD = 0.2
+QUARANTINE = [
+    ({"t::clean": [PASS] * 8}, set()),
+    ({"t::flaky": [PASS, PASS, FLAKY, PASS, FAIL]}, {"t::flaky"}),
+    ({"t::few_runs": [FLAKY, FAIL, PASS]}, set()),                 # below MIN_RUNS
+    ({"t::broken": [PASS, PASS] + [FAIL] * 5}, set()),
+    ({"t::rare": [PASS] * 9 + [FLAKY]}, set()),                    # 0.1 < threshold
+    ({"t::edge": [PASS] * 4 + [FLAKY]}, {"t::edge"}),              # exactly at threshold
+]
+
+
+class TestFlaky:
+
+    @pytest.mark.parametrize("runs, expected", RATES)
+    def test_flake_rate(self, runs, expected):
+        assert flaky.flake_rate(runs) == pytest.approx(expected), f"{runs}: rate {flaky.flake_rate(runs)}"
+
+    @pytest.mark.parametrize("history, expected", QUARANTINE)
+    def test_quarantined(self, history, expected):
+        assert set(flaky.quarantined(history)) == expected
+
+    def test_quarantined_reports_rate(self):
+        rates = flaky.quarantined({"t::flaky": [PASS, FLAKY, PASS, FAIL, PASS]}, threshold=0.4)
+        assert rates == {"t::flaky": pytest.approx(0.4)}
@@ -0,0 +1,46 @@
+import pytest
+
+from utils.http_login import INVALID_CREDENTIALS, parse_error, parse_token
+
+# ---- Login page parsing (no browser, no network) ----
+# login page HTML -> CSRF token
+TOKENS = [
+    ('<auth-login :token="&quot;abc.DEF-123&quot;"></auth-login>', "abc.DEF-123"),   # JSON string prop
+    ('<auth-login :token="abc.DEF-123"></auth-login>', "abc.DEF-123"),               # bare prop
+    ('<input type="hidden" name="_token" value="xyz&amp;1">', "xyz&1"),              # plain form
+    ('<auth-login :token="&quot;prop&quot;"><input name="_token" value="input">', "prop"),
+]
+
+# page without a token: the client must not POST an empty one
+NO_TOKEN = [
+    "",
+    "<auth-login :error=\"null\"></auth-login>",
+    '<input type="hidden" name="_csrf" value="other">',
+]
+
+# login page HTML after a failed attempt -> flash message
+ERRORS = [
+    ('<auth-login :error="{&quot;message&quot;:&quot;Invalid credentials&quot;}">', "Invalid credentials"),
+    ('<auth-login :error="{&quot;message&quot;:&quot;Account disabled&quot;}">', "Account disabled"),
+    ('<auth-login :error="null">', None),
+    ('<auth-login :error="{&quot;type&quot;:&quot;x&quot;}">', None),                # no message
+    ('<auth-login :error="not json">Invalid credentials</auth-login>', INVALID_CREDENTIALS),
+    ("<p>Invalid credentials</p>", INVALID_CREDENTIALS),                            # rendered text only
+    ("", None),
+]
+
+
+class TestHttpLoginParsing:
+
+    @pytest.mark.parametrize("page, expected", TOKENS)
+    def test_parse_token(self, page, expected):
+        assert parse_token(page) == expected
+
+    @pytest.mark.parametrize("page", NO_TOKEN)
+    def test_parse_token_missing(self, page):
+        with pytest.raises(ValueError, match="CSRF"):
+            parse_token(page)
+
+    @pytest.mark.parametrize("page, expected", ERRORS)
+    def test_parse_error(self, page, expected):
+        assert parse_error(page) == expected
@@ -0,0 +1,53 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ---- Import-time budget (no browser needed) ----
+# What collection imports: conftest, the page registry and every test module
+COLLECTED = ("conftest", "pages") + tuple(
+    f"tests.{os.path.basename(path)[:-3]}" for path in sorted(glob.glob(os.path.join(ROOT_DIR, "tests", "test_*.py"))))
+# Only imported once a fixture / page object actually needs them
+HEAVY = ("selenium", "webdriver_manager", "requests", "openpyxl", "numpy", "PIL")
+BUDGET = 0.3   # seconds on top of `import pytest`
+
+_PROBE = """
+import json, sys, time
+import pytest
+start = time.perf_counter()
+for name in sys.argv[1].split(","):
+    __import__(name)
+print(json.dumps({"elapsed": time.perf_counter() - start,
+                  "heavy": [m for m in sys.argv[2].split(",") if m in sys.modules]}))
+"""
+
+
+@pytest.fixture(scope="module")
+def probe():
+    # Fresh interpreter: modules already imported by this session would hide the cost
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, ",".join(COLLECTED), ",".join(HEAVY)],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class TestImports:
+
+    def test_no_heavy_imports_at_collection(self, probe):
+        assert not probe["heavy"], f"imported while collecting: {probe['heavy']}"
+
+    def test_collection_import_budget(self, probe):
+        assert probe["elapsed"] < BUDGET, f"collection imports took {probe['elapsed']:.3f}s (budget {BUDGET}s)"
+
+    def test_pages_registry_is_lazy(self):
+        import pages
+
+        assert set(pages.__all__) == {"BasePage", "LoginPage", "DashboardPage", "AsyncLoginPage", "AsyncDashboardPage"}
+        with pytest.raises(AttributeError):
+            pages.NoSuchPage
@@ -1,8 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.by import By
-from pages.login_page import LoginPage
+
+import pages
+from utils import testcases
+from utils.http_login import HttpLoginClient
+
+# ---- Test Cases (Testcase/TestCase_OrangehrmDemo.xlsx, sheet "LogIn") ----
+# Username/password and the expected message come from the sheet
+INVALID_ARGS = ("ID", "case", "username", "password", "expected")
+INVALID_CASES = {
+    "LG_02": {"username": "WrongUser123"},   # WrongUser exists on the demo now (see sheet remark)
+    "LG_03": {},
+    "LG_04": {},
+    "LG_05": {},
+    "LG_06": {},
+    "LG_07": {},
+    "LG_08": {},
+    "LG_09": {},
+    "LG_11": {},
+}
+# Empty fields never reach the server: the Vue form (and HttpLoginClient, mirroring it)
+# stops at "Required" before submitting. These rows test client-side validation only
+CLIENT_SIDE = ("LG_04",)
+SERVER_PARAMS = testcases.params(
+    "LogIn", INVALID_ARGS, {ID: binding for ID, binding in INVALID_CASES.items() if ID not in CLIENT_SIDE})
+CLIENT_PARAMS = testcases.params(
+    "LogIn", INVALID_ARGS, {ID: binding for ID, binding in INVALID_CASES.items() if ID in CLIENT_SIDE})
+
+# Rendering of the error alert and of the "Required" hint still go through the browser;
+# the server response of every other case is covered browserless by TestLoginHttp
+UI_CASES = {ID: INVALID_CASES[ID] for ID in ("LG_03", "LG_04")}
 
 @pytest.mark.usefixtures("open_login_page")
 class TestLogin:
@@ -10,52 +38,63 @@ class TestLogin:
     # --- Success case ---
     def test_login_success(self, open_login_page, request):
         driver = open_login_page
-        login_page = LoginPage(driver)
+        login_page = pages.LoginPage(driver)
 
-        login_page.enter_username("Admin")
-        login_page.enter_password("admin123")
-        login_page.click_login()
+        result = login_page.attempt_login("Admin", "admin123")
 
-        dashboard = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located((By.XPATH, "//h6[text()='Dashboard']"))
-        )
-        assert dashboard.is_displayed(), "page not found"
+        assert result.ok, f"login failed: {result.error}"
+        assert pages.DashboardPage(driver).dashboard_loaded(), "page not found"
+        login_page.capture_perf("submit")
         print(f"{request.node.name}: Pass (successful login)")
 
     # --- Invalid cases gộp lại ---
-    @pytest.mark.parametrize(
-        "username,password,expected_error,case_name",
-        [
-            ("WrongUser123", "admin123", "Invalid credentials", "Invalid Username"),
-            ("Admin", "wrongpass", "Invalid credentials", "Invalid Password"),
-            ("", "", "Required", "Empty Username & Password"),
-            ("a"*101, "admin123", "Invalid credentials", "Too Long Username"),
-            ("Admin", "a"*51, "Invalid credentials", "Too Long Password"),
-            ("Adm", "admin123", "Invalid credentials", "Too Short Username"),
-            ("Admin", "short", "Invalid credentials", "Too Short Password"),
-            ("!@#$%", "^&*()", "Invalid credentials", "Special Characters"),
-            ("admin", "Admin123", "Invalid credentials", "Case Sensitive"),
-        ]
-    )
-    def test_invalid_login(self, open_login_page, request, username, password, expected_error, case_name):
+    @pytest.mark.parametrize(INVALID_ARGS, testcases.params("LogIn", INVALID_ARGS, UI_CASES))
+    def test_invalid_login(self, open_login_page, request, ID, case, username, password, expected):
         driver = open_login_page
-        login_page = LoginPage(driver)
+        login_page = pages.LoginPage(driver)
 
-        login_page.enter_username(username)
-        login_page.enter_password(password)
-        login_page.click_login()
+        # attempt_login chờ alert lỗi hoặc "Required", tuỳ loại lỗi
+        result = login_page.attempt_login(username, password)
+        error_msg = result.error or ""
 
-        # Chọn locator theo loại lỗi
-        if expected_error == "Required":
-            locator = (By.XPATH, "//span[text()='Required']")
-        else:
-            locator = (By.XPATH, "//div[@class='oxd-alert-content oxd-alert-content--error']")
+        assert not result.ok, f"{ID} - {case}: logged in ({result.url})"
+        assert expected in error_msg
+        # In ra rõ tên test case + message
+        print(f"{request.node.name} | {ID} - {case}: Pass (error massage: {error_msg})")
 
-        error_elm = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located(locator)
-        )
-        error_msg = error_elm.text
 
-        assert expected_error in error_msg
-        # In ra rõ tên test case + message
-        print(f"{request.node.name} | {case_name}: Pass (error massage: {error_msg})")
+# ---- Browserless fast path (utils.http_login) ----
+@pytest.fixture(scope="module")
+def http_login_results():
+    # Submit every negative case at once: pooled connections, one thread per case
+    cases = [param.values for param in SERVER_PARAMS if not param.marks]
+    client = HttpLoginClient(pool_size=max(1, len(cases)))
+    with ThreadPoolExecutor(max_workers=max(1, len(cases))) as pool:
+        futures = {ID: pool.submit(client.attempt_login, username, password)
+                   for ID, _, username, password, _ in cases}
+    yield futures
+    client.close()
+
+
+class TestLoginHttp:
+
+    @pytest.mark.parametrize(INVALID_ARGS, SERVER_PARAMS)
+    def test_invalid_login_http(self, http_login_results, ID, case, username, password, expected):
+        result = http_login_results[ID].result()
+
+        assert not result.ok, f"{ID} - {case}: logged in ({result.url})"
+        assert expected in (result.error or ""), f"{ID} - {case}: got {result.error!r}, expected {expected!r}"
+        print(f"{ID} - {case}: Pass (error message: {result.error})")
+
+    # Client-side validation: checks HttpLoginClient's mirror of the form, the server is never asked
+    @pytest.mark.parametrize(INVALID_ARGS, CLIENT_PARAMS)
+    def test_invalid_login_client_side(self, ID, case, username, password, expected):
+        client = HttpLoginClient(pool_size=1)
+        try:
+            result, session = client.login(username, password)
+        finally:
+            client.close()
+
+        assert session is None, f"{ID} - {case}: empty fields were submitted"
+        assert not result.ok and result.error == expected, f"{ID} - {case}: got {result.error!r}, expected {expected!r}"
+        print(f"{ID} - {case}: Pass (client-side: {result.error})")
@@ -0,0 +1,51 @@
+import pytest
+
+from utils.parallel import DEFAULT_DURATION, _passthrough, assign_shards
+
+# ---- Sharding (no browser needed) ----
+# nodeids, known durations, workers -> expected [(shard, load)]
+SHARDS = [
+    # Longest first, each to the least loaded worker
+    (["a", "b", "c", "d"], {"a": 10, "b": 8, "c": 3, "d": 2}, 2,
+     [(["a", "d"], 12.0), (["b", "c"], 11.0)]),
+    # Unknown durations count as the mean of the known ones (6 here)
+    (["a", "u", "b"], {"a": 10, "b": 2}, 2,
+     [(["a"], 10.0), (["u", "b"], 8.0)]),
+    # Nothing known yet: DEFAULT_DURATION each, round-robin in collection order
+    (["t1", "t2", "t3"], {}, 2,
+     [(["t1", "t3"], 2 * DEFAULT_DURATION), (["t2"], DEFAULT_DURATION)]),
+    # Durations of tests no longer collected are ignored
+    (["a", "b"], {"a": 4, "b": 4, "gone": 100}, 2,
+     [(["a"], 4.0), (["b"], 4.0)]),
+    # More workers than tests: no empty shards
+    (["a", "b"], {"a": 1, "b": 2}, 4,
+     [(["b"], 2.0), (["a"], 1.0)]),
+    (["a", "b", "c"], {"a": 1}, 1,
+     [(["a", "b", "c"], 3.0)]),
+]
+
+# pytest args, positional paths pytest reported -> args forwarded to every worker
+PASSTHROUGH = [
+    (["--junitxml", "out/x.xml", "tests/test_login.py"], ["tests/test_login.py"],
+     ["--junitxml", "out/x.xml"]),
+    (["--basetemp", "tests", "-s", "tests"], ["tests"],                     # same string as value and path
+     ["--basetemp", "tests", "-s"]),
+    (["tests/test_login.py::TestLogin", "--pool-size", "2"], ["tests/test_login.py::TestLogin"],
+     ["--pool-size", "2"]),
+    (["--lean", "-k", "dashboard"], [], ["--lean", "-k", "dashboard"]),
+]
+
+
+class TestParallel:
+
+    @pytest.mark.parametrize("nodeids, durations, workers, expected", SHARDS)
+    def test_assign_shards(self, nodeids, durations, workers, expected):
+        shards = assign_shards(nodeids, durations, workers)
+
+        assert [(shard, pytest.approx(load)) for shard, load in shards] == expected
+        assigned = [nodeid for shard, _ in shards for nodeid in shard]
+        assert sorted(assigned) == sorted(nodeids), "every test runs exactly once"
+
+    @pytest.mark.parametrize("args, paths, expected", PASSTHROUGH)
+    def test_passthrough_keeps_option_values(self, args, paths, expected):
+        assert _passthrough(args, paths) == expected
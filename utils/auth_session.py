@@ -0,0 +1,147 @@
+import json
+import threading
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from pages.login_page import LoginPage
+from utils import config
+from utils.waits import Waits
+
+
+# JS to dump / restore Web Storage of the current origin
+_DUMP_STORAGE_JS = """
+var dump = function (s) {
+    var out = {};
+    for (var i = 0; i < s.length; i++) { var k = s.key(i); out[k] = s.getItem(k); }
+    return out;
+};
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_RESTORE_STORAGE_JS = """
+var data = arguments[0];
+Object.keys(data.local).forEach(function (k) { window.localStorage.setItem(k, data.local[k]); });
+Object.keys(data.session).forEach(function (k) { window.sessionStorage.setItem(k, data.session[k]); });
+"""
+
+# Same restore, run by the browser at the start of every new document of `origin`
+# (Page.addScriptToEvaluateOnNewDocument): storage is in place before the app's scripts run,
+# without loading a page first
+_RESTORE_ON_NEW_DOCUMENT_JS = """
+(function (data, origin) {
+    if (location.origin !== origin) return;
+    Object.keys(data.local).forEach(function (k) { window.localStorage.setItem(k, data.local[k]); });
+    Object.keys(data.session).forEach(function (k) { window.sessionStorage.setItem(k, data.session[k]); });
+})(%s, %s);
+"""
+
+DASHBOARD_HEADER = (By.XPATH, "//h6[text()='Dashboard']")
+
+
+class AuthSession:
+    """
+    Cache of one authenticated OrangeHRM session (per worker process).
+
+    - First call: log in through the UI and capture cookies + Web Storage
+    - Later calls: inject the captured state and open the dashboard URL directly
+    - Expired session (redirected back to login): log in through the UI again
+    """
+
+    def __init__(self, username=config.ADMIN_USERNAME, password=config.ADMIN_PASSWORD):
+        self.username = username
+        self.password = password
+        self.cookies = None
+        self.storage = None
+        self._lock = threading.Lock()
+
+    def login(self, driver):
+        # Return `driver` on the dashboard, reusing the cached session if possible.
+        # The lock only guards the cached state: restores run in parallel across drivers,
+        # a UI login (refresh) runs once while the other callers wait for its result.
+        with self._lock:
+            cookies, storage = self.cookies, self.storage
+        if cookies is not None and self._restore(driver, cookies, storage):
+            return driver
+        with self._lock:
+            fresh = self.cookies is not None and self.cookies is not cookies
+            if not fresh:
+                self._ui_login(driver)
+                return driver
+            cookies, storage = self.cookies, self.storage   # refreshed by another caller meanwhile
+        if self._restore(driver, cookies, storage):
+            return driver
+        with self._lock:
+            self._ui_login(driver)
+        return driver
+
+    def invalidate(self):
+        with self._lock:
+            self.cookies = None
+            self.storage = None
+
+    # ---- Internal ----
+    def _ui_login(self, driver):
+        # Full login through the login form, then capture the session (caller holds the lock)
+        self.cookies = None
+        self.storage = None
+        if "/auth/login" not in driver.current_url:
+            driver.get(config.LOGIN_URL)
+        login_page = LoginPage(driver)
+        login_page.enter_username(self.username)
+        login_page.enter_password(self.password)
+        login_page.click_login()
+        Waits(driver, 15).visible(DASHBOARD_HEADER)
+        # Dashboard document reached through the POST + redirect: timing of the login submit
+        login_page.capture_perf("submit")
+
+        self.cookies = driver.get_cookies()
+        self.storage = driver.execute_script(_DUMP_STORAGE_JS)
+
+    def _restore(self, driver, cookies, storage):
+        # Inject a captured session, then open the dashboard; False if it has expired
+        on_origin = False
+        try:
+            for cookie in cookies:
+                params = {k: v for k, v in cookie.items() if k in ("name", "value", "domain", "path", "secure", "httpOnly", "expiry")}
+                if "expiry" in params:
+                    params["expires"] = params.pop("expiry")
+                # CDP sets cookies without first loading a page of that domain
+                driver.execute_cdp_cmd("Network.setCookie", params)
+        except (WebDriverException, AttributeError):
+            # Not Chromium: cookies can only be added on a page of the same domain
+            driver.get(config.LOGIN_URL)
+            on_origin = True
+            for cookie in cookies:
+                driver.add_cookie(cookie)
+
+        # Storage goes in before the dashboard's scripts run. No page is loaded for it:
+        # the lean profile blocks cheap same-origin resources (favicon, images)
+        injected = None
+        if storage and (storage["local"] or storage["session"]):
+            if on_origin:
+                driver.execute_script(_RESTORE_STORAGE_JS, storage)
+            else:
+                injected = self._inject_storage(driver, storage)
+
+        try:
+            driver.get(config.DASHBOARD_URL)
+        finally:
+            if injected:
+                # Only for this load: later documents must keep what the app stores
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": injected})
+        return "/auth/login" not in driver.current_url
+
+    def _inject_storage(self, driver, storage):
+        # Register the restore for the next document of the app's origin; identifier to remove it
+        parts = urlsplit(config.BASE_URL)
+        source = _RESTORE_ON_NEW_DOCUMENT_JS % (json.dumps(storage), json.dumps(f"{parts.scheme}://{parts.netloc}"))
+        try:
+            driver.execute_cdp_cmd("Page.enable", {})
+            return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})["identifier"]
+        except (WebDriverException, AttributeError):
+            # No CDP after all: restore on the login page (never blocked) before the dashboard
+            driver.get(config.LOGIN_URL)
+            driver.execute_script(_RESTORE_STORAGE_JS, storage)
+            return None
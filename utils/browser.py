@@ -0,0 +1,18 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from utils import lean as lean_profile
+
+
+def create_chrome(driver_path, options=None, lean=False):
+    # Start a new Chrome on an already resolved chromedriver binary.
+    # No implicit wait: every page object waits explicitly through utils.waits
+    if lean:
+        options = lean_profile.lean_options(options)
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    if lean:
+        # Headless, fixed viewport; images / fonts / media / analytics blocked
+        lean_profile.set_blocking(driver, True)
+    else:
+        driver.maximize_window()
+    return driver
@@ -0,0 +1,254 @@
+"""
+Transport asyncio tới Chrome DevTools Protocol (CDP), cho page object async (pages/async_pages.py).
+
+Mỗi lệnh WebDriver là một request HTTP chặn tới chromedriver; ở đây mọi lệnh của một
+browser đi trên một websocket, nhiều lệnh cùng bay một lúc (ghép theo id), nên:
+- các truy vấn độc lập trong một trang await cùng nhau được (asyncio.gather)
+- một event loop điều khiển được nhiều browser
+
+    async with cdp.session(driver) as page_session:      # driver Selenium đang mở
+        title = await page_session.call("return document.title")
+
+Kết nối thẳng tới DevTools của Chrome mà chromedriver đã mở (debuggerAddress), gắn vào
+tab hiện tại của driver; Selenium vẫn dùng song song được. Chỉ dùng thư viện chuẩn
+(websocket client tối giản, chỉ text frame).
+"""
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import struct
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+DEFAULT_TIMEOUT = 30
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_TEXT, _CLOSE, _PING, _PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class CdpError(WebDriverException):
+    # Protocol-level error answered by the browser (or the connection went away)
+    pass
+
+
+# ---- Websocket (RFC 6455, client side) ----
+class _WebSocket:
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, url):
+        parts = urlsplit(url)
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80, limit=2 ** 24)
+        key = base64.b64encode(os.urandom(16)).decode()
+        # No Origin header: Chrome only checks --remote-allow-origins for requests that send one
+        writer.write((
+            f"GET {parts.path or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+            f"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        ).encode())
+        await writer.drain()
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        if " 101 " not in head.split("\r\n", 1)[0] or accept not in head:
+            writer.close()
+            raise CdpError(f"websocket handshake with {url} failed: {head.splitlines()[0] if head else 'no answer'}")
+        return cls(reader, writer)
+
+    def _frame(self, opcode, payload):
+        # Client frames are always masked
+        header = bytes([0x80 | opcode])
+        n = len(payload)
+        if n < 126:
+            header += bytes([0x80 | n])
+        elif n < 2 ** 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", n)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", n)
+        mask = os.urandom(4)
+        repeated = (mask * (n // 4 + 1))[:n]
+        masked = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(n, "big") if n else b""
+        return header + mask + masked
+
+    async def send(self, text):
+        # write() is synchronous, so frames of concurrent senders never interleave
+        self._writer.write(self._frame(_TEXT, text.encode()))
+        await self._writer.drain()
+
+    async def recv(self):
+        # Next complete text message; answers pings, reassembles fragments
+        message = b""
+        while True:
+            b0, b1 = await self._reader.readexactly(2)
+            opcode, n = b0 & 0x0F, b1 & 0x7F
+            if n == 126:
+                n, = struct.unpack("!H", await self._reader.readexactly(2))
+            elif n == 127:
+                n, = struct.unpack("!Q", await self._reader.readexactly(8))
+            mask = await self._reader.readexactly(4) if b1 & 0x80 else None
+            payload = await self._reader.readexactly(n)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            if opcode == _CLOSE:
+                raise ConnectionError("websocket closed by the browser")
+            if opcode == _PING:
+                self._writer.write(self._frame(_PONG, payload))
+                continue
+            if opcode == _PONG:
+                continue
+            message += payload
+            if b0 & 0x80:
+                return message.decode()
+
+    async def close(self):
+        try:
+            self._writer.write(self._frame(_CLOSE, b""))
+            self._writer.close()
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+# ---- CDP ----
+class CdpConnection:
+    # One browser-level DevTools websocket; commands are matched to answers by id
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def open(cls, url):
+        return cls(await _WebSocket.connect(url))
+
+    async def send(self, method, params=None, session_id=None, timeout=DEFAULT_TIMEOUT):
+        if self._reader.done():
+            raise CdpError("DevTools connection is closed")
+        msg_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        message = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise CdpError(f"{method}: no answer in {timeout}s") from None
+        finally:
+            self._pending.pop(msg_id, None)
+
+    async def _read(self):
+        try:
+            while True:
+                message = json.loads(await self._ws.recv())
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue   # events: the page objects don't subscribe to any
+                if "error" in message:
+                    future.set_exception(CdpError(message["error"].get("message", "CDP error")))
+                else:
+                    future.set_result(message.get("result", {}))
+        except (ConnectionError, asyncio.IncompleteReadError, OSError) as exc:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError(f"DevTools connection lost: {exc}"))
+
+    async def close(self):
+        self._reader.cancel()
+        await self._ws.close()
+
+
+class CdpSession:
+    # Commands scoped to one tab (flattened target session)
+
+    def __init__(self, connection, session_id, target_id, owns_connection=False):
+        self.connection = connection
+        self.session_id = session_id
+        self.target_id = target_id
+        self._owns_connection = owns_connection
+
+    async def send(self, method, **params):
+        return await self.connection.send(method, params, self.session_id)
+
+    async def evaluate(self, expression):
+        # Value of a JS expression (promises awaited), like execute_script's return value
+        result = await self.send("Runtime.evaluate", expression=expression, awaitPromise=True,
+                                 returnByValue=True, userGesture=True)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise JavascriptException(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"].get("value")
+
+    async def call(self, script, *args):
+        # Same contract as driver.execute_script: `script` is a function body reading `arguments`
+        return await self.evaluate(f"(function () {{\n{script}\n}}).apply(null, {json.dumps(list(args))})")
+
+    async def call_async(self, script, *args):
+        # Same contract as driver.execute_async_script: the last argument is the callback
+        return await self.evaluate(
+            f"new Promise(function (resolve) {{ (function () {{\n{script}\n}})"
+            f".apply(null, {json.dumps(list(args))}.concat([resolve])); }})"
+        )
+
+    async def close(self):
+        try:
+            await self.connection.send("Target.detachFromTarget", {"sessionId": self.session_id}, timeout=5)
+        except CdpError:
+            pass   # tab already gone
+        if self._owns_connection:
+            await self.connection.close()
+
+
+def devtools_address(driver):
+    # host:port of the DevTools endpoint chromedriver started the browser with
+    for key in ("goog:chromeOptions", "ms:edgeOptions"):
+        address = (driver.capabilities.get(key) or {}).get("debuggerAddress")
+        if address:
+            return address
+    raise CdpError("browser exposes no DevTools address (not a Chromium browser?)")
+
+
+def _get_json(url):
+    import urllib.request
+
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.load(response)
+
+
+async def attach(driver, connection=None):
+    """
+    CdpSession on the driver's current tab. Without `connection`, opens one for this
+    browser (closed with the session); pass one to share it between several tabs.
+    """
+    owns = connection is None
+    if owns:
+        version = await asyncio.to_thread(_get_json, f"http://{devtools_address(driver)}/json/version")
+        connection = await CdpConnection.open(version["webSocketDebuggerUrl"])
+    # chromedriver window handles are DevTools target ids (old versions add a prefix)
+    target = driver.current_window_handle.removeprefix("CDwindow-")
+    try:
+        result = await connection.send("Target.attachToTarget", {"targetId": target, "flatten": True})
+    except CdpError:
+        if owns:
+            await connection.close()
+        raise
+    return CdpSession(connection, result["sessionId"], target, owns_connection=owns)
+
+
+@asynccontextmanager
+async def session(driver):
+    cdp_session = await attach(driver)
+    try:
+        yield cdp_session
+    finally:
+        await cdp_session.close()
@@ -0,0 +1,21 @@
+import os
+
+# --- OrangeHRM URLs ---
+DEMO_BASE_URL = "https://opensource-demo.orangehrmlive.com"
+BASE_URL = os.environ.get("ORANGEHRM_BASE_URL", DEMO_BASE_URL).rstrip("/")
+LOGIN_URL = f"{BASE_URL}/web/index.php/auth/login"
+VALIDATE_URL = f"{BASE_URL}/web/index.php/auth/validate"
+DASHBOARD_URL = f"{BASE_URL}/web/index.php/dashboard/index"
+
+# --- Tài khoản admin của trang demo ---
+ADMIN_USERNAME = "Admin"
+ADMIN_PASSWORD = "admin123"
+
+
+def set_base_url(base_url):
+    # Chuyển toàn bộ suite sang server khác (vd. stand-in server local)
+    global BASE_URL, LOGIN_URL, VALIDATE_URL, DASHBOARD_URL
+    BASE_URL = base_url.rstrip("/")
+    LOGIN_URL = f"{BASE_URL}/web/index.php/auth/login"
+    VALIDATE_URL = f"{BASE_URL}/web/index.php/auth/validate"
+    DASHBOARD_URL = f"{BASE_URL}/web/index.php/dashboard/index"
@@ -0,0 +1,266 @@
+"""
+Quét toàn bộ module của OrangeHRM theo menu bên trái, song song trên nhiều browser đã login.
+
+    python -m utils.crawler                  # 4 browser, site model từ cache nếu có
+    python -m utils.crawler -n 8 --refresh   # đọc lại menu trước khi quét
+    python -m utils.crawler --base-url https://hrm.example.com --json crawl.json
+
+- Site model (tên module -> URL) đọc từ menu của dashboard một lần, cache theo base URL
+  trong .site_model.json; --refresh để đọc lại
+- N browser headless (DriverPool), mỗi browser login một lần (AuthSession dùng chung,
+  chỉ browser đầu login qua UI, các browser sau inject cookie) rồi lấy lần lượt module
+  từ hàng đợi chung
+- Mỗi module: mở URL, chờ trang render xong (header module hiện, hết spinner), ghi thời
+  gian load; bị đẩy về trang login thì login lại và thử thêm một lần
+- Kết quả: bảng xếp theo thời gian load, module lỗi lên đầu rồi tới module chậm nhất
+
+Mặc định chạy profile lean (chặn ảnh / font / analytics): thời gian là của ứng dụng, không
+tính ảnh; --full để tải đủ như người dùng thật.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+from utils import config
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SITE_MODEL_FILE = os.path.join(ROOT_DIR, ".site_model.json")
+
+# Wait in the page until the module has rendered: document loaded, module header shown,
+# no loading spinner left. Returns where we landed and the Navigation Timing of the load.
+_RENDERED_JS = """
+var header = arguments[0], spinner = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1], start = Date.now();
+(function poll() {
+    var h = document.readyState === 'complete' ? document.querySelector(header) : null;
+    var busy = document.querySelector(spinner) !== null;
+    if ((h && !busy) || Date.now() - start > timeout) {
+        var nav = performance.getEntriesByType('navigation')[0];
+        done({
+            url: location.href,
+            header: h ? h.textContent.trim() : null,
+            busy: busy,
+            ttfb: nav ? Math.round(nav.responseStart - nav.requestStart) : null,
+            load: nav ? Math.round(nav.loadEventEnd) : null,
+            api: performance.getEntriesByType('resource').filter(function (e) {
+                return e.initiatorType === 'fetch' || e.initiatorType === 'xmlhttprequest';
+            }).length
+        });
+    } else setTimeout(poll, 50);
+})();
+"""
+HEADER_CSS = "h6.oxd-topbar-header-breadcrumb-module"
+SPINNER_CSS = ".oxd-loading-spinner"
+
+
+@dataclass(frozen=True)
+class Module:
+    name: str      # menu label, e.g. "PIM"
+    path: str      # URL path, e.g. "/web/index.php/pim/viewPimModule"
+
+    @property
+    def url(self):
+        return urljoin(config.BASE_URL + "/", self.path.lstrip("/"))
+
+
+@dataclass(frozen=True)
+class Visit:
+    module: str
+    url: str
+    landed: Optional[str]
+    header: Optional[str]      # module header shown on the page (None: did not render)
+    elapsed_ms: float          # driver.get + render, as the user waits for it
+    ttfb_ms: Optional[int]
+    load_ms: Optional[int]     # loadEvent end (the SPA keeps rendering after it)
+    api_calls: int
+    worker: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.header is not None and "/auth/login" not in (self.landed or "")
+
+
+# ---- Site model ----
+def read_site_model(driver):
+    # Modules of the sidebar menu, read from a logged-in dashboard
+    from pages.dashboard_page import DashboardPage
+
+    return [Module(name, urlsplit(url).path) for name, url in DashboardPage(driver).menu_links() if name]
+
+
+def load_site_model(path=SITE_MODEL_FILE, base_url=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f).get(base_url or config.BASE_URL)
+    except (OSError, ValueError):
+        return None
+    return [Module(**m) for m in entry["modules"]] if entry else None
+
+
+def save_site_model(modules, path=SITE_MODEL_FILE, base_url=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            models = json.load(f)
+    except (OSError, ValueError):
+        models = {}
+    models[base_url or config.BASE_URL] = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modules": [asdict(m) for m in modules],
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(models, f, indent=1)
+    os.replace(tmp, path)
+
+
+# ---- Visiting ----
+def visit(driver, module, auth, worker="", timeout=20):
+    # Open one module and wait for it to render; a bounce to the login page re-logs in once
+    for attempt in (1, 2):
+        start = time.perf_counter()
+        driver.get(module.url)
+        landed = driver.execute_async_script(_RENDERED_JS, HEADER_CSS, SPINNER_CSS, int(timeout * 1000))
+        elapsed = (time.perf_counter() - start) * 1000
+        if "/auth/login" in landed["url"] and attempt == 1:
+            auth.invalidate()
+            auth.login(driver)
+            continue
+        return Visit(
+            module=module.name, url=module.url, landed=landed["url"], header=landed["header"],
+            elapsed_ms=round(elapsed, 1), ttfb_ms=landed["ttfb"], load_ms=landed["load"],
+            api_calls=landed["api"], worker=worker,
+            error="still loading" if landed["busy"] else None,
+        )
+
+
+def _worker(pool, auth, modules, visits, lock, name):
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        driver = pool.acquire()
+    except Exception:
+        return   # browser did not start: the other workers take its share
+    broken = False
+    try:
+        auth.login(driver)
+        while True:
+            try:
+                module = modules.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = visit(driver, module, auth, worker=name)
+            except WebDriverException as exc:
+                result = _failed(module, name, exc)
+            with lock:
+                visits.append(result)
+    except WebDriverException:
+        broken = True   # could not log in: leave the queue to the other workers
+    finally:
+        pool.release(driver, discard=broken)
+
+
+def _failed(module, worker, error):
+    message = error if isinstance(error, str) else f"{type(error).__name__}: {getattr(error, 'msg', error)}"
+    return Visit(module.name, module.url, None, None, 0.0, None, None, 0, worker, error=message)
+
+
+def crawl(pool, auth, modules, workers):
+    """
+    Visit every module with `workers` authenticated browsers from `pool` (DriverPool)
+    sharing `auth` (AuthSession). Returns the visits, failures first, then slowest first.
+    """
+    todo = queue.Queue()
+    for module in modules:
+        todo.put(module)
+    visits, lock = [], threading.Lock()
+    threads = [
+        threading.Thread(target=_worker, args=(pool, auth, todo, visits, lock, f"browser-{i + 1}"),
+                         name=f"crawler-{i + 1}", daemon=True)
+        for i in range(max(1, min(workers, len(modules))))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Left over only if every browser failed to start or log in
+    while not todo.empty():
+        visits.append(_failed(todo.get_nowait(), "", "not visited: no browser could log in"))
+    return rank(visits)
+
+
+def rank(visits):
+    # Failures first, then slowest first
+    return sorted(visits, key=lambda v: (v.ok, -v.elapsed_ms))
+
+
+def print_table(visits, elapsed):
+    print(f"{len(visits)} modules in {elapsed:.1f}s")
+    print(f"{'#':>3} {'module':18} {'ms':>8} {'ttfb':>6} {'load':>7} {'api':>4}  {'status':8} header")
+    for i, v in enumerate(visits, 1):
+        status = "ok" if v.ok else "FAIL"
+        cells = [f"{x:>{w}}" if x is not None else f"{'-':>{w}}" for x, w in ((v.ttfb_ms, 6), (v.load_ms, 7))]
+        print(f"{i:3} {v.module:18} {v.elapsed_ms:8.0f} {cells[0]} {cells[1]} {v.api_calls:4}  "
+              f"{status:8} {v.error or v.header or ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--browsers", type=int, default=4, help="số browser đã login chạy song song")
+    parser.add_argument("--refresh", action="store_true", help="đọc lại menu thay vì dùng .site_model.json")
+    parser.add_argument("--full", action="store_true", help="tải đủ ảnh / font (không dùng profile lean)")
+    parser.add_argument("--offline", action="store_true", help="chỉ dùng chromedriver có sẵn trên máy")
+    parser.add_argument("--base-url", help="OrangeHRM cần quét (mặc định: ORANGEHRM_BASE_URL / trang demo)")
+    parser.add_argument("--json", help="ghi kết quả ra file JSON")
+    args = parser.parse_args(argv)
+
+    from functools import partial
+
+    from utils import lean as lean_profile
+    from utils.auth_session import AuthSession
+    from utils.browser import create_chrome
+    from utils.driver_pool import DriverPool
+    from utils.driver_resolver import resolve_chromedriver
+
+    if args.base_url:
+        config.set_base_url(args.base_url)
+    workers = max(1, args.browsers)
+    lean = not args.full
+    pool = DriverPool(
+        partial(create_chrome, resolve_chromedriver(offline=args.offline).path, lean=lean),
+        size=workers, window_size=lean_profile.WINDOW_SIZE if lean else None,
+    ).start()   # the other browsers warm up while the first one reads the menu
+    auth = AuthSession()
+    try:
+        modules = None if args.refresh else load_site_model()
+        if not modules:
+            driver = pool.acquire()
+            try:
+                modules = read_site_model(auth.login(driver))
+            finally:
+                pool.release(driver)
+            save_site_model(modules)
+
+        start = time.perf_counter()
+        visits = crawl(pool, auth, modules, workers)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+
+    print_table(visits, elapsed)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"base_url": config.BASE_URL, "browsers": workers, "elapsed": round(elapsed, 2),
+                       "visits": [{**asdict(v), "ok": v.ok} for v in visits]}, f, indent=2)
+    return 0 if all(v.ok for v in visits) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+
+# JS to wipe Web Storage of the page the browser is currently on
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class DriverPool:
+    """
+    Session-wide pool of pre-warmed browsers.
+
+    - Browsers are started in the background, before a test asks for one
+    - release() resets state (tabs, storage, cookies, window size) instead of quitting
+    - A browser that cannot be reset is quit and replaced by a background refill
+    """
+
+    def __init__(self, factory, size=1, window_size=None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.window_size = window_size   # (w, h) for a fixed viewport, else maximize
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._all = set()
+        self._pending = 0
+        self._closed = False
+        self._refill = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="driver-refill")
+
+    # ---- Lifecycle ----
+    def start(self):
+        # Warm up `size` browsers without blocking the caller
+        for _ in range(self.size):
+            self._schedule_refill()
+        return self
+
+    def close(self):
+        # Quit every browser the pool has ever handed out
+        self._closed = True
+        self._refill.shutdown(wait=True)
+        with self._lock:
+            drivers, self._all = list(self._all), set()
+        for driver in drivers:
+            self._quit(driver)
+
+    # ---- Acquire / Release ----
+    def acquire(self, timeout=60):
+        # Take a warm browser; start a new one only if none is idle or warming up
+        with self._lock:
+            starved = self._idle.empty() and self._pending == 0
+        if starved:
+            self._schedule_refill()
+        driver = self._idle.get(timeout=timeout)
+        if isinstance(driver, Exception):
+            # The factory failed in the background thread
+            raise driver
+        return driver
+
+    def release(self, driver, discard=False):
+        # Give a browser back; reset it, or replace it if it is unusable
+        if self._closed:
+            self._discard(driver)
+            return
+        if not discard:
+            try:
+                self.reset(driver)
+            except WebDriverException:
+                discard = True
+        if discard:
+            self._discard(driver)
+            self._schedule_refill()
+        else:
+            self._idle.put(driver)
+
+    def reset(self, driver):
+        # Close extra tabs, clear storage/cookies, restore window size
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Storage is per origin: clear it while still on the page under test
+        driver.execute_script(_CLEAR_STORAGE_JS)
+        driver.delete_all_cookies()
+        try:
+            # Cookies of every domain, not only the current one
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except (WebDriverException, AttributeError):
+            pass
+
+        driver.get("about:blank")
+        if self.window_size:
+            driver.set_window_size(*self.window_size)
+        else:
+            driver.maximize_window()
+
+    # ---- Internal ----
+    def _schedule_refill(self):
+        if self._closed:
+            return
+        with self._lock:
+            self._pending += 1
+        self._refill.submit(self._spawn)
+
+    def _spawn(self):
+        try:
+            driver = self.factory()
+        except Exception as exc:
+            driver = exc
+        with self._lock:
+            self._pending -= 1
+            if not isinstance(driver, Exception):
+                self._all.add(driver)
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._all.discard(driver)
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,135 @@
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+# --- Cache chromedriver theo major version của Chrome ---
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".driver_cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "chromedriver.json")
+
+# Biến môi trường dùng để ghim đường dẫn cho các worker
+ENV_PATH = "CHROMEDRIVER_PATH"
+
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+
+@dataclass(frozen=True)
+class DriverResolution:
+    path: str
+    chrome_version: str
+    source: str        # env | cache | wdm-cache | download | path
+    elapsed: float     # seconds
+
+
+def detect_chrome_version():
+    # Return the locally installed Chrome version ("120.0.6099.109"), or "" if unknown
+    if sys.platform.startswith("win"):
+        commands = [
+            ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"],
+            ["reg", "query", r"HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon", "/v", "version"],
+        ]
+    elif sys.platform == "darwin":
+        commands = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+    else:
+        commands = [[name, "--version"] for name in
+                    ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+
+    for cmd in commands:
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(out)
+        if match:
+            return match.group(0)
+    return ""
+
+
+def _major(version):
+    return version.split(".")[0] if version else ""
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(major, path):
+    # Atomic write so parallel workers never read a half-written file
+    cache = _load_cache()
+    cache[major] = path
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, CACHE_FILE)
+
+
+def _from_wdm_cache(major):
+    # Look for a matching binary already downloaded by webdriver_manager (~/.wdm)
+    root = os.getcwd() if os.environ.get("WDM_LOCAL") == "1" else os.path.expanduser("~")
+    name = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+    pattern = os.path.join(root, ".wdm", "drivers", "chromedriver", "*", f"{major}.*", "**", name)
+    candidates = sorted(glob.glob(pattern, recursive=True), reverse=True)
+    return candidates[0] if candidates else ""
+
+
+def resolve_chromedriver(offline=False):
+    """
+    Tìm chromedriver khớp với Chrome đang cài, ưu tiên cache local:
+    1. Biến môi trường CHROMEDRIVER_PATH (đã ghim bởi process cha / worker khác)
+    2. Cache .driver_cache/chromedriver.json theo major version
+    3. Cache ~/.wdm của webdriver_manager
+    4. Tải bằng webdriver_manager (bỏ qua khi offline)
+    5. chromedriver trong PATH
+    """
+    start = time.perf_counter()
+    version = ""
+
+    def done(path, source):
+        os.environ[ENV_PATH] = path
+        return DriverResolution(path, version, source, time.perf_counter() - start)
+
+    pinned = os.environ.get(ENV_PATH)
+    if pinned and os.path.isfile(pinned):
+        return done(pinned, "env")
+
+    version = detect_chrome_version()
+    major = _major(version)
+
+    if major:
+        cached = _load_cache().get(major)
+        if cached and os.path.isfile(cached):
+            return done(cached, "cache")
+
+        found = _from_wdm_cache(major)
+        if found:
+            _save_cache(major, found)
+            return done(found, "wdm-cache")
+
+    if not offline:
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception:
+            path = ""
+        if path:
+            if major:
+                _save_cache(major, path)
+            return done(path, "download")
+
+    on_path = shutil.which("chromedriver")
+    if on_path:
+        return done(on_path, "path")
+    raise RuntimeError(
+        f"No chromedriver found for Chrome {version or '(not detected)'}"
+        f"{' in offline mode' if offline else ''}; set {ENV_PATH} to a local binary"
+    )
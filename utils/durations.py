@@ -0,0 +1,24 @@
+import json
+import os
+
+# --- Thời gian chạy của từng test (nodeid -> giây), dùng để chia shard ---
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DURATIONS_FILE = os.path.join(ROOT_DIR, ".test_durations.json")
+
+
+def load_durations(path=DURATIONS_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations, path=DURATIONS_FILE, merge=True):
+    # Merge new measurements into the file and write it atomically
+    data = load_durations(path) if merge else {}
+    data.update({nodeid: round(seconds, 3) for nodeid, seconds in durations.items()})
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
@@ -0,0 +1,130 @@
+"""
+Retry tại chỗ cho lỗi tạm thời + quarantine test flaky.
+
+- Mặc định tắt (--retries 0); bật rõ ràng khi cần, vd. trong CI với --retries 1
+- Thân test fail vì lỗi tạm thời (timeout, stale element, click bị che...) được chạy lại
+  ngay trên cùng driver, sau khi chạy các hàm reset rẻ mà fixture đã đăng ký
+  (on_retry), không khởi động lại browser / login lại
+- Kết quả mỗi lần chạy (pass / flaky / fail) lưu theo nodeid vào .flaky_history.json
+- Test vừa pass vừa fail với tỉ lệ flaky >= ngưỡng -> quarantine: xfail(strict=False),
+  vẫn chạy và vẫn ghi lịch sử nhưng không làm đỏ cả run
+"""
+import json
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_FILE = os.path.join(ROOT_DIR, ".flaky_history.json")
+
+# Exception names from selenium.common.exceptions (resolved lazily: the conftest imports
+# this module at collection time, selenium is only loaded by the first retried test)
+TRANSIENT_NAMES = (
+    "TimeoutException",
+    "StaleElementReferenceException",
+    "ElementClickInterceptedException",
+    "ElementNotInteractableException",
+)
+
+
+def transient():
+    # Exception classes retried in place
+    from selenium.common import exceptions
+
+    return tuple(getattr(exceptions, name) for name in TRANSIENT_NAMES)
+
+HISTORY_LIMIT = 30    # outcomes kept per test
+MIN_RUNS = 5          # don't judge a test on fewer runs than this
+THRESHOLD = 0.2       # share of non-clean runs that quarantines an intermittent test
+
+PASS, FLAKY, FAIL = "pass", "flaky", "fail"
+
+
+# ---- Retry ----
+def on_retry(request, reset):
+    # Register a cheap state reset, run (in registration order) before a retried attempt
+    node = request.node
+    if not hasattr(node, "_retry_resets"):
+        node._retry_resets = []
+    node._retry_resets.append(reset)
+
+
+def close_extra_windows(driver):
+    # Back to the first window; tabs left open by the failed attempt are closed
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+
+def wrap_runtest(item, retries):
+    # Replace item.runtest with a version that re-runs the test body on transient errors
+    item._retries = 0
+    if retries <= 0:
+        return
+    original = item.runtest
+    retried = transient()
+
+    def runtest():
+        while True:
+            try:
+                return original()
+            except retried as exc:
+                if item._retries >= retries:
+                    raise
+                item._retries += 1
+                print(f"{item.name}: {type(exc).__name__}, retry {item._retries}/{retries} on the same driver")
+                for reset in getattr(item, "_retry_resets", ()):
+                    reset()
+
+    item.runtest = runtest
+
+
+def outcome(report, retries):
+    # History entry for a finished call phase (None: skipped, nothing to learn)
+    if report.skipped and not hasattr(report, "wasxfail"):
+        return None
+    if report.failed or (report.skipped and hasattr(report, "wasxfail")):
+        return FAIL   # failed, or failed while quarantined (xfail)
+    return FLAKY if retries else PASS
+
+
+# ---- History / quarantine ----
+def load_history(path=HISTORY_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record(outcomes, path=HISTORY_FILE):
+    # Append this session's outcomes (nodeid -> pass / flaky / fail), keep the last HISTORY_LIMIT
+    if not outcomes:
+        return
+    history = load_history(path)
+    for nodeid, result in outcomes.items():
+        runs = history.setdefault(nodeid, [])
+        runs.append(result)
+        del runs[:-HISTORY_LIMIT]
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def flake_rate(runs, min_runs=MIN_RUNS):
+    # Share of runs that were not clean passes. 0 for tests that never pass, or that
+    # failed every recent run: those are broken, and quarantining would hide it
+    if PASS not in runs and FLAKY not in runs:
+        return 0.0
+    if len(runs) >= min_runs and all(r == FAIL for r in runs[-min_runs:]):
+        return 0.0
+    return sum(r != PASS for r in runs) / len(runs)
+
+
+def quarantined(history, threshold=THRESHOLD, min_runs=MIN_RUNS):
+    # nodeid -> flake rate, for tests that are intermittent above the threshold
+    return {
+        nodeid: rate for nodeid, runs in history.items()
+        if len(runs) >= min_runs and (rate := flake_rate(runs, min_runs)) >= threshold
+    }
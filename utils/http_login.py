@@ -0,0 +1,113 @@
+"""
+Login OrangeHRM qua HTTP, không cần browser (cho các case login sai / biên).
+
+Cùng interface với LoginPage:  attempt_login(username, password) -> LoginResult
+
+- GET trang login, lấy CSRF token (prop :token của component <auth-login>)
+- POST /auth/validate, theo redirect: về lại /auth/login = thất bại, đọc message lỗi
+- Username / password trống: form chặn ở client ("Required"), không gửi request nào
+
+Mỗi lần thử dùng cookie jar riêng (token gắn với PHP session) nhưng chung một
+connection pool, nên gọi song song từ nhiều thread được.
+"""
+import html
+import json
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from utils import config
+
+_TOKEN_PROP = re.compile(r':token="([^"]*)"')
+_TOKEN_INPUT = re.compile(r'name="_token"[^>]*value="([^"]*)"')
+_ERROR_PROP = re.compile(r':error="([^"]*)"')
+
+REQUIRED = "Required"
+INVALID_CREDENTIALS = "Invalid credentials"
+
+
+@dataclass(frozen=True)
+class LoginResult:
+    # Outcome of one login attempt, through the UI (LoginPage) or over HTTP (HttpLoginClient)
+    ok: bool                  # landed outside /auth/login
+    error: Optional[str]      # "Invalid credentials", "Required", ... (None on success)
+    url: Optional[str]        # final URL (None when the form never submitted)
+
+
+def parse_token(page):
+    # CSRF token of the login form
+    match = _TOKEN_PROP.search(page)
+    if match:
+        value = html.unescape(match.group(1))
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value.strip('"')
+    match = _TOKEN_INPUT.search(page)
+    if match:
+        return html.unescape(match.group(1))
+    raise ValueError("No CSRF token in the login page")
+
+
+def parse_error(page):
+    # Flash message the login page renders after a failed attempt
+    match = _ERROR_PROP.search(page)
+    if match:
+        try:
+            error = json.loads(html.unescape(match.group(1)))
+        except ValueError:
+            error = None
+        if isinstance(error, dict) and error.get("message"):
+            return error["message"]
+    return INVALID_CREDENTIALS if INVALID_CREDENTIALS in page else None
+
+
+class HttpLoginClient:
+
+    def __init__(self, pool_size=10, timeout=15):
+        # requests is only imported once a client exists (LoginPage imports LoginResult from here)
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.timeout = timeout
+        # One pooled adapter shared by every attempt; GETs retried on connection errors / 5xx
+        self._adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                              allowed_methods=frozenset({"GET"})),
+        )
+
+    def _session(self):
+        import requests
+
+        session = requests.Session()
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+        return session
+
+    def attempt_login(self, username, password):
+        result, _ = self.login(username, password)
+        return result
+
+    def login(self, username, password):
+        # (LoginResult, requests.Session holding the login cookies). Don't close the session:
+        # Session.close() would close the shared adapter; client.close() does that once
+        if not username or not password:
+            # The Vue form validates before submitting: nothing goes over the wire
+            return LoginResult(False, REQUIRED, None), None
+
+        session = self._session()
+        page = session.get(config.LOGIN_URL, timeout=self.timeout)
+        page.raise_for_status()
+        response = session.post(
+            config.VALIDATE_URL,
+            data={"_token": parse_token(page.text), "username": username, "password": password},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        if "/auth/login" in response.url:
+            return LoginResult(False, parse_error(response.text), response.url), session
+        return LoginResult(True, None, response.url), session
+
+    def close(self):
+        self._adapter.close()
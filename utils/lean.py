@@ -0,0 +1,138 @@
+"""
+Lean browser profile: headless, fixed viewport, và chặn ảnh / font / media / analytics
+qua DevTools (Network.setBlockedURLs). Test cần kiểm tra giao diện đánh dấu
+@pytest.mark.visual để tắt chặn cho riêng test đó.
+
+Mỗi test được đo số request / bytes đã tải và số request bị chặn; bytes tiết kiệm
+được ước lượng từ kích thước đã biết của cùng URL, học từ các lần tải không bị chặn:
+test `visual` khi chạy --lean, và mọi test khi chạy không --lean (Resource Timing của
+trang lúc teardown), lưu trong .lean_sizes.json. URL bị chặn chưa biết kích thước được
+đếm riêng (unknown), không tính là 0 byte.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES_FILE = os.path.join(ROOT_DIR, ".lean_sizes.json")
+
+WINDOW_SIZE = (1366, 768)
+
+BLOCKED_URLS = [
+    # Images
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.bmp",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    # Media
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+    # Analytics / tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*",
+    "*facebook.net*", "*clarity.ms*",
+]
+
+
+def lean_options(options=None):
+    # Chrome options for the lean profile (performance log is needed for accounting)
+    from selenium.webdriver.chrome.options import Options
+
+    options = options or Options()
+    options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--mute-audio")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def set_blocking(driver, enabled=True):
+    # Turn resource blocking on / off for this browser (persists across navigations)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS if enabled else []})
+
+
+@dataclass(frozen=True)
+class NetworkUsage:
+    requests: int
+    bytes: int
+    blocked_requests: int
+    blocked_bytes: int      # estimate from learned sizes of the blocked URLs
+    blocked_unknown: int    # blocked requests whose size was never learned (not in blocked_bytes)
+
+
+class SizeBook:
+    # URL -> encoded size learned from unblocked loads, shared by the whole session
+
+    def __init__(self, path=SIZES_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.sizes = json.load(f)
+        except (OSError, ValueError):
+            self.sizes = {}
+        self.dirty = False
+
+    def learn(self, url, size):
+        with self._lock:
+            if self.sizes.get(url) != size:
+                self.sizes[url] = size
+                self.dirty = True
+
+    def get(self, url):
+        # Learned size, None if this URL was never loaded unblocked
+        return self.sizes.get(url)
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            data = dict(self.sizes)
+            self.dirty = False
+        # Parallel workers share the file: keep what the others learned meanwhile
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = {**json.load(f), **data}
+        except (OSError, ValueError):
+            pass
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def measure(driver, sizes):
+    # Drain the performance log and summarize network usage since the last call
+    urls, requests, transferred = {}, 0, 0
+    blocked = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif method == "Network.loadingFinished":
+            requests += 1
+            size = int(params.get("encodedDataLength", 0))
+            transferred += size
+            url = urls.get(params["requestId"])
+            if url and size:
+                sizes.learn(url, size)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked.append(urls.get(params["requestId"], ""))
+    known = [size for size in map(sizes.get, blocked) if size is not None]
+    return NetworkUsage(requests, transferred, len(blocked), sum(known), len(blocked) - len(known))
+
+
+# Transfer size of every resource (and the document) the current page loaded
+_RESOURCE_SIZES_JS = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .map(function (e) { return [e.name, e.transferSize || e.encodedBodySize || 0]; })
+    .filter(function (p) { return p[1] > 0; });
+"""
+
+
+def learn(driver, sizes):
+    # Full-profile runs: learn the sizes of what the current page loaded (no performance log
+    # needed). Cached and cross-origin entries without Timing-Allow-Origin report 0: skipped
+    for url, size in driver.execute_script(_RESOURCE_SIZES_JS) or ():
+        sizes.learn(url, int(size))
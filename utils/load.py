@@ -0,0 +1,238 @@
+"""
+Tạo tải lên OrangeHRM bằng chính flow login / dashboard của suite.
+
+    python -m utils.load -u 20 --ramp-up 10 --duration 60            # HTTP, stand-in local
+    python -m utils.load -u 4 --mode browser --iterations 5           # Chrome headless
+    python -m utils.load -u 50 --base-url https://hrm.example.com --json load.json
+
+- N virtual user khởi động rải đều trong --ramp-up giây, lặp flow tới hết --duration
+  (hoặc đủ --iterations lần mỗi user)
+- http: HttpLoginClient (mỗi user một connection keep-alive) + GET dashboard
+- browser: mỗi user một Chrome headless, LoginPage.attempt_login + DashboardPage.snapshot
+- Không truyền --base-url: chạy với stand-in server trong process (utils/standin.py)
+
+Kết quả theo từng step: số lần, lỗi, throughput, p50/p90/p95/p99.
+"""
+import argparse
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from utils import config
+from utils.waits import percentile
+
+STEPS_HTTP = ("login", "dashboard")
+STEPS_BROWSER = ("start_browser", "open_login", "login", "dashboard")
+# Row for errors that ended a virtual user outside any step (listed only when there are some)
+USER_STEP = "user"
+
+
+class LoadStats:
+    # Thread-safe latency / error collector, per step
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @contextmanager
+    def step(self, name):
+        # Time one step; an exception counts as an error of that step and ends the iteration
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self.error(name, exc)
+            raise
+        else:
+            with self._lock:
+                self.latencies[name].append(time.perf_counter() - start)
+
+    def error(self, name, exc):
+        with self._lock:
+            self.errors[name][type(exc).__name__] += 1
+
+    def summary(self, steps):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        rows = []
+        with self._lock:
+            extra = [name for name in self.errors if name not in steps]
+        for name in (*steps, *extra):
+            samples, errors = self.latencies.get(name, []), self.errors.get(name, Counter())
+            total = len(samples) + sum(errors.values())
+            row = {
+                "step": name,
+                "count": total,
+                "errors": sum(errors.values()),
+                "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+                "throughput": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                "error_kinds": dict(errors),
+            }
+            for pct in (50, 90, 95, 99):
+                row[f"p{pct}_ms"] = round(percentile(samples, pct) * 1000, 1) if samples else None
+            rows.append(row)
+        return {"elapsed": round(elapsed, 2), "steps": rows}
+
+
+class StepFailed(Exception):
+    # The step completed but the application answered wrongly (e.g. bounced to login)
+    pass
+
+
+# ---- Virtual users ----
+def http_user(stats, deadline, iterations, stop):
+    from utils.http_login import HttpLoginClient
+
+    client = None
+    try:
+        client = HttpLoginClient(pool_size=1)
+        for _ in _iterations(deadline, iterations, stop):
+            try:
+                with stats.step("login"):
+                    result, session = client.login(config.ADMIN_USERNAME, config.ADMIN_PASSWORD)
+                    if not result.ok:
+                        raise StepFailed(result.error or "login failed")
+                with stats.step("dashboard"):
+                    response = session.get(config.DASHBOARD_URL, timeout=client.timeout)
+                    response.raise_for_status()
+                    if "/auth/login" in response.url:
+                        raise StepFailed("session not accepted")
+            except Exception:
+                continue   # already counted against its step
+    except Exception as exc:
+        stats.error(USER_STEP, exc)   # the user stopped early: must show in the results
+    finally:
+        if client:
+            client.close()
+
+
+def browser_user(stats, deadline, iterations, stop, driver_path):
+    from pages.dashboard_page import DashboardPage
+    from pages.login_page import LoginPage
+    from utils.browser import create_chrome
+
+    driver = None
+    try:
+        with stats.step("start_browser"):
+            driver = create_chrome(driver_path, lean=True)
+        for _ in _iterations(deadline, iterations, stop):
+            try:
+                with stats.step("open_login"):
+                    driver.get(config.LOGIN_URL)
+                with stats.step("login"):
+                    result = LoginPage(driver).attempt_login(config.ADMIN_USERNAME, config.ADMIN_PASSWORD)
+                    if not result.ok:
+                        raise StepFailed(result.error or "login failed")
+                with stats.step("dashboard"):
+                    if not DashboardPage(driver).snapshot().ready:
+                        raise StepFailed("dashboard widgets did not render")
+            except Exception:
+                pass   # already counted against its step
+            finally:
+                driver.delete_all_cookies()   # next iteration logs in from scratch
+    except Exception as exc:
+        if driver is not None:   # a failed start is already counted under start_browser
+            stats.error(USER_STEP, exc)
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass   # browser already gone
+
+
+def _iterations(deadline, iterations, stop):
+    count = 0
+    while not stop.is_set() and time.perf_counter() < deadline and (not iterations or count < iterations):
+        count += 1
+        yield count
+
+
+# ---- Runner ----
+def run(users, ramp_up, duration, iterations=0, mode="http", driver_path=None):
+    stats = LoadStats()
+    stop = threading.Event()
+    deadline = stats.started + ramp_up + duration
+    target = http_user if mode == "http" else browser_user
+    extra = () if mode == "http" else (driver_path,)
+
+    threads = []
+    try:
+        for i in range(users):
+            # Spread user starts evenly over the ramp-up window
+            delay = stats.started + (ramp_up * i / users) - time.perf_counter()
+            if delay > 0 and stop.wait(delay):
+                break
+            thread = threading.Thread(target=target, args=(stats, deadline, iterations, stop, *extra),
+                                      name=f"vu-{i + 1}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    stats.finished = time.perf_counter()
+    return stats.summary(STEPS_HTTP if mode == "http" else STEPS_BROWSER)
+
+
+def print_summary(summary, users, mode):
+    print(f"{users} users ({mode}), {summary['elapsed']:.1f}s")
+    print(f"{'step':12} {'count':>7} {'err %':>6} {'req/s':>7} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in summary["steps"]:
+        cells = [f"{row[k]:8.1f}" if row[k] is not None else f"{'-':>8}"
+                 for k in ("p50_ms", "p90_ms", "p95_ms", "p99_ms")]
+        print(f"{row['step']:12} {row['count']:7} {row['error_rate'] * 100:6.1f} {row['throughput']:7.2f} " + " ".join(cells))
+        for kind, count in row["error_kinds"].items():
+            print(f"{'':12} {count:7} x {kind}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-u", "--users", type=int, default=10, help="số virtual user chạy đồng thời")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="giây để khởi động đủ số user")
+    parser.add_argument("--duration", type=float, default=30.0, help="giây chạy sau ramp-up")
+    parser.add_argument("--iterations", type=int, default=0, help="số vòng tối đa mỗi user (0 = theo --duration)")
+    parser.add_argument("--mode", choices=("http", "browser"), default="http")
+    parser.add_argument("--base-url", help="OrangeHRM cần tạo tải (mặc định: stand-in server local)")
+    parser.add_argument("--standin-capture", metavar="PATH", help="thư mục bản ghi của stand-in server")
+    parser.add_argument("--json", help="ghi kết quả ra file JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.base_url:
+        config.set_base_url(args.base_url)
+    else:
+        from utils.standin import Capture, StandinServer
+        try:
+            capture = Capture(args.standin_capture) if args.standin_capture else None
+            server = StandinServer(capture=capture).start()
+        except RuntimeError as exc:
+            parser.error(f"{exc} (or pass --base-url)")
+        config.set_base_url(server.origin)
+
+    driver_path = None
+    if args.mode == "browser":
+        from utils.driver_resolver import resolve_chromedriver
+        driver_path = resolve_chromedriver().path
+
+    try:
+        summary = run(max(1, args.users), args.ramp_up, args.duration, args.iterations, args.mode, driver_path)
+    finally:
+        if server:
+            server.stop()
+
+    print_summary(summary, args.users, args.mode)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"users": args.users, "mode": args.mode, "base_url": config.BASE_URL, **summary}, f, indent=2)
+    return 1 if any(row["errors"] for row in summary["steps"]) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""
+Theo dõi bộ nhớ browser theo từng test: pytest --memory [--memory-ceiling 1024]
+
+Trước và sau mỗi test, fixture `driver` lấy một mẫu của browser đang dùng:
+- RSS / CPU của cả cây process chromedriver -> chrome -> renderer / GPU (cần psutil)
+- JS heap, số DOM node / document / event listener (CDP Performance.getMetrics)
+
+Phần tăng được quy cho test gây ra nó:
+- delta: sau test - trước test (trang của test vẫn đang mở)
+- retained: lần lấy browser tiếp theo - lần này, tức phần còn lại sau khi pool đã reset
+  browser (about:blank, xoá cookie / storage): bộ nhớ test đó để lại cho test sau
+
+Browser vượt --memory-ceiling (MB, RSS; không có psutil thì tính theo JS heap) bị bỏ
+khỏi pool thay vì reset, pool khởi động browser mới ở background.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:  # psutil là tuỳ chọn: không có thì chỉ đo JS heap qua CDP
+    psutil = None
+
+MB = 1024 * 1024
+CEILING_MB = 1024
+
+# CDP Performance.getMetrics name -> MemorySample field
+_METRICS = {
+    "JSHeapUsedSize": "js_heap",
+    "JSHeapTotalSize": "js_heap_total",
+    "Nodes": "nodes",
+    "Documents": "documents",
+    "JSEventListeners": "listeners",
+}
+
+
+@dataclass(frozen=True)
+class MemorySample:
+    rss: Optional[int]            # bytes, chromedriver + chrome process tree (None: no psutil)
+    cpu: Optional[float]          # CPU seconds (user + system) of the live processes
+    processes: int
+    js_heap: Optional[int]        # bytes used by the current tab's JS heap
+    js_heap_total: Optional[int]
+    nodes: Optional[int]
+    documents: Optional[int]
+    listeners: Optional[int]
+
+    @property
+    def footprint(self):
+        # What the ceiling is checked against
+        return self.rss if self.rss is not None else self.js_heap
+
+
+def _delta(after, before, name):
+    a, b = getattr(after, name), getattr(before, name)
+    return None if a is None or b is None else a - b
+
+
+def _mb(value):
+    return None if value is None else round(value / MB, 1)
+
+
+# ---- Sampling ----
+def process_tree(driver):
+    # chromedriver and everything it started (browser, renderers, GPU, utility processes)
+    if psutil is None:
+        return []
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return []   # remote driver, or the service already exited
+
+
+def js_metrics(driver):
+    # Metrics of the current tab; {} if the browser has no CDP (or is gone)
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        raw = driver.execute_cdp_cmd("Performance.getMetrics", {})
+    except (WebDriverException, AttributeError):
+        return {}
+    return {_METRICS[m["name"]]: int(m["value"]) for m in raw.get("metrics", ()) if m["name"] in _METRICS}
+
+
+def sample(driver):
+    rss, cpu, count = None, None, 0
+    processes = process_tree(driver)
+    if processes:
+        rss, cpu = 0, 0.0
+        for proc in processes:
+            try:
+                rss += proc.memory_info().rss
+                times = proc.cpu_times()
+                cpu += times.user + times.system
+                count += 1
+            except psutil.Error:
+                pass   # renderer exited while we were walking the tree
+    metrics = js_metrics(driver)
+    return MemorySample(rss=rss, cpu=cpu, processes=count, **{f: metrics.get(f) for f in _METRICS.values()})
+
+
+# ---- Watchdog ----
+class MemoryWatchdog:
+    # Per-test memory accounting for the drivers of this process; thread-safe
+
+    def __init__(self, ceiling_mb=CEILING_MB):
+        self.ceiling = ceiling_mb * MB if ceiling_mb else None
+        self._lock = threading.Lock()
+        self._last = {}        # session id -> (nodeid, sample taken when that test got the driver)
+        self.deltas = {}       # nodeid -> property dict (see after())
+        self.retained = {}     # nodeid -> bytes the test left behind in the browser
+        self.recycled = []     # (nodeid, footprint) of browsers dropped for crossing the ceiling
+
+    def before(self, driver, nodeid):
+        # Sample of a freshly acquired (reset) browser; settles the previous test's retained growth
+        current = sample(driver)
+        with self._lock:
+            previous = self._last.get(driver.session_id)
+            if previous:
+                prev_id, prev_sample = previous
+                growth = _delta(current, prev_sample, "rss")
+                if growth is None:
+                    growth = _delta(current, prev_sample, "js_heap")
+                if growth is not None:
+                    self.retained[prev_id] = growth
+            self._last[driver.session_id] = (nodeid, current)
+        return current
+
+    def after(self, driver, nodeid, before):
+        """
+        Sample at teardown, before the pool resets the browser.
+        Returns (properties for the report, True if the browser should be recycled).
+        """
+        current = sample(driver)
+        cpu = _delta(current, before, "cpu")
+        over = self.ceiling is not None and (current.footprint or 0) > self.ceiling
+        props = {
+            "rss_mb": _mb(current.rss),
+            "rss_delta_mb": _mb(_delta(current, before, "rss")),
+            "cpu_s": None if cpu is None else round(max(0.0, cpu), 2),   # renderers may have exited
+            "processes": current.processes,
+            "js_heap_mb": _mb(current.js_heap),
+            "js_heap_delta_mb": _mb(_delta(current, before, "js_heap")),
+            "nodes_delta": _delta(current, before, "nodes"),
+            "listeners_delta": _delta(current, before, "listeners"),
+            "recycled": over,
+        }
+        with self._lock:
+            self.deltas[nodeid] = props
+            if over:
+                self.recycled.append((nodeid, current.footprint))
+                self._last.pop(driver.session_id, None)   # the replacement starts from scratch
+        return props, over
+
+    def top_retained(self, n=10):
+        with self._lock:
+            return sorted(self.retained.items(), key=lambda kv: kv[1], reverse=True)[:n]
@@ -0,0 +1,172 @@
+"""
+Chạy test song song trên N worker process, mỗi worker một browser riêng.
+
+    python -m utils.parallel -n 4 [pytest args...]
+
+- Test được chia theo thời gian chạy lần trước, test dài nhất được xếp trước
+- Mỗi worker ghi kết quả vào thư mục riêng (.parallel/<worker>/)
+- Cuối cùng gộp lại thành một report.json / report.xml theo thứ tự collect và cập nhật durations
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from utils import flaky, perf, results
+from utils.durations import ROOT_DIR, load_durations, save_durations
+
+WORK_DIR = os.path.join(ROOT_DIR, ".parallel")
+REPORT_JSON = os.path.join(ROOT_DIR, "report.json")
+REPORT_JUNIT = os.path.join(ROOT_DIR, "report.xml")
+
+# Thời gian mặc định cho test chưa từng chạy
+DEFAULT_DURATION = 10.0
+
+
+# Line on which collect()'s pytest reports the positional test paths it was given
+_PATHS_MARK = "parallel-paths: "
+
+
+def collect(pytest_args):
+    # Return (node ids in collection order, positional test paths / node ids in pytest_args).
+    # This module is loaded as a plugin so pytest itself says which arguments are paths
+    # and which are option values (e.g. --junitxml out/x.xml)
+    cmd = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "utils.parallel", *pytest_args]
+    out = subprocess.run(cmd, cwd=ROOT_DIR, capture_output=True, text=True).stdout
+    paths = []
+    for line in out.splitlines():
+        if line.startswith(_PATHS_MARK):
+            paths = json.loads(line[len(_PATHS_MARK):])
+    return [line.strip() for line in out.splitlines() if "::" in line and not line.startswith(_PATHS_MARK)], paths
+
+
+def pytest_collection_finish(session):
+    # Plugin hook, only active in collect()'s subprocess (-p utils.parallel)
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter:
+        reporter.write_line(_PATHS_MARK + json.dumps(session.config.getoption("file_or_dir") or []))
+
+
+def assign_shards(nodeids, durations, workers):
+    """
+    Longest-processing-time-first: sort by known duration (desc) and give each
+    test to the currently least loaded worker.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = sum(known) / len(known) if known else DEFAULT_DURATION
+
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for nodeid in sorted(nodeids, key=lambda n: durations.get(n, fallback), reverse=True):
+        idx = loads.index(min(loads))
+        shards[idx].append(nodeid)
+        loads[idx] += durations.get(nodeid, fallback)
+    return [(shard, load) for shard, load in zip(shards, loads) if shard]
+
+
+def _resolve_driver_once():
+    # Pin chromedriver in the environment so workers don't each resolve it
+    from utils.driver_resolver import resolve_chromedriver
+    try:
+        resolve_chromedriver()
+    except RuntimeError as exc:
+        print(f"chromedriver not pinned: {exc}")
+
+
+def run(workers, pytest_args):
+    nodeids, paths = collect(pytest_args)
+    if not nodeids:
+        print("No tests collected")
+        return 1
+
+    shards = assign_shards(nodeids, load_durations(), workers)
+    shutil.rmtree(WORK_DIR, ignore_errors=True)
+    _resolve_driver_once()
+
+    procs = []
+    start = time.perf_counter()
+    run_id = time.strftime("%Y%m%d-%H%M%S")   # one screenshot run for all workers
+    for i, (shard, load) in enumerate(shards):
+        worker_id = f"gw{i}"
+        worker_dir = os.path.join(WORK_DIR, worker_id)
+        os.makedirs(worker_dir)
+        args_file = os.path.join(worker_dir, "args.txt")
+        with open(args_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(shard))
+
+        env = dict(os.environ, PYTEST_WORKER_ID=worker_id, PYTEST_WORKER_DIR=worker_dir, PYTEST_RUN_ID=run_id)
+        log = open(os.path.join(worker_dir, "output.log"), "w", encoding="utf-8")
+        cmd = [sys.executable, "-m", "pytest", f"@{args_file}", *_passthrough(pytest_args, paths)]
+        procs.append((worker_id, subprocess.Popen(cmd, cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT), log))
+        print(f"{worker_id}: {len(shard)} tests, ~{load:.1f}s expected")
+
+    exit_codes = []
+    for worker_id, proc, log in procs:
+        exit_codes.append(proc.wait())
+        log.close()
+        print(f"{worker_id}: exit code {exit_codes[-1]}")
+
+    merge(nodeids, [os.path.join(WORK_DIR, w) for w, _, _ in procs])
+    _prune_screenshots()
+    print(f"Parallel run finished in {time.perf_counter() - start:.1f}s")
+    return max(exit_codes)
+
+
+def _prune_screenshots():
+    # Workers never prune the shared screenshot store; do it once all of them are done
+    from utils.screenshots import ScreenshotWriter
+    root = os.path.join(ROOT_DIR, "screenshots")
+    if os.path.isdir(os.path.join(root, "runs")):
+        ScreenshotWriter(root).prune()
+
+
+def _passthrough(pytest_args, paths):
+    # Keep options with their values (e.g. --pool-size 2, --junitxml out/x.xml, -s); drop the
+    # positional paths / node ids collect() consumed: workers get their shard via @args.txt.
+    # A string given both as an option value and as a path: the last occurrence is the path
+    args = list(pytest_args)
+    for path in paths:
+        for i in range(len(args) - 1, -1, -1):
+            if args[i] == path:
+                del args[i]
+                break
+    return args
+
+
+def merge(nodeids, worker_dirs):
+    # Combine per-worker report.json files into one report (collection order) + durations, perf, flaky history
+    reports, durations, samples, outcomes = [], {}, [], {}
+    for worker_dir in worker_dirs:
+        samples.extend(perf.load_samples(os.path.join(worker_dir, "perf.json")))
+        outcomes.update({nodeid: runs[-1] for nodeid, runs in
+                         flaky.load_history(os.path.join(worker_dir, "flaky.json")).items()})
+        try:
+            reports.append(results.load(os.path.join(worker_dir, "report.json")))
+        except (OSError, ValueError):
+            continue
+        durations.update(load_durations(os.path.join(worker_dir, "durations.json")))
+
+    if reports:
+        sink = results.merge(reports)
+        order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+        sink.results = dict(sorted(sink.results.items(), key=lambda kv: order.get(kv[0], len(order))))
+        sink.write(REPORT_JSON, REPORT_JUNIT)
+    if durations:
+        save_durations(durations)
+    # --perf: one time-series entry for the whole run, not one per worker
+    perf.append_run(samples)
+    flaky.record(outcomes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2)
+    args, pytest_args = parser.parse_known_args(argv)
+    return run(max(1, args.workers), pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
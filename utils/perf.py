@@ -0,0 +1,247 @@
+"""
+Đo hiệu năng phía ứng dụng (OrangeHRM) trong lúc chạy test: pytest --perf
+
+Sau mỗi lần điều hướng / thao tác chính (mở trang login, submit login, load dashboard,
+search) page object gọi capture_perf(action): một lần execute_async_script lấy
+Navigation Timing, Resource Timing và long task kể từ lần đo trước trên cùng document.
+
+Cuối session, số liệu được gộp theo (page, action) và ghi thêm một dòng cho mỗi
+cặp vào .perf_history.jsonl (time-series theo từng lần chạy). Xem xu hướng:
+
+    python -m utils.perf            # 10 lần chạy gần nhất, đánh dấu chỗ chậm đi
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from utils.results import phase
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERF_FILE = os.path.join(ROOT_DIR, ".perf_history.jsonl")
+
+# Latest run slower than the median of earlier runs by more than this -> flagged
+REGRESSION_RATIO = 1.25
+
+# Everything since the previous capture on this document, in one call.
+# Long tasks come from a buffered PerformanceObserver, delivered asynchronously.
+_CAPTURE_JS = """
+var settle = arguments[0], done = arguments[arguments.length - 1];
+var since = window.__perfMark || 0, now = performance.now();
+window.__perfMark = now;
+var round = function (v) { return Math.round(v * 10) / 10; };
+
+var navigation = null, nav = performance.getEntriesByType('navigation')[0];
+if (!since && nav) navigation = {
+    ttfb: round(nav.responseStart - nav.requestStart),
+    response: round(nav.responseEnd - nav.responseStart),
+    redirect: round(nav.redirectEnd - nav.redirectStart),
+    redirect_count: nav.redirectCount,
+    dom_interactive: round(nav.domInteractive),
+    dom_content_loaded: round(nav.domContentLoadedEventEnd),
+    load: round(nav.loadEventEnd),
+    transfer: nav.transferSize
+};
+
+var resources = performance.getEntriesByType('resource').filter(function (e) { return e.startTime >= since; });
+var api = resources.filter(function (e) { return e.initiatorType === 'fetch' || e.initiatorType === 'xmlhttprequest'; });
+var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5);
+
+var tasks = [], observer = null;
+try {
+    observer = new PerformanceObserver(function (list) { tasks = tasks.concat(list.getEntries()); });
+    observer.observe({type: 'longtask', buffered: true});
+} catch (e) { observer = null; }
+
+setTimeout(function () {
+    if (observer) { tasks = tasks.concat(observer.takeRecords()); observer.disconnect(); }
+    tasks = tasks.filter(function (t) { return t.startTime >= since; });
+    done({
+        url: location.href,
+        navigation: navigation,
+        resources: resources.length,
+        transfer: resources.reduce(function (s, e) { return s + (e.transferSize || 0); }, 0),
+        api_ms: api.map(function (e) { return round(e.duration); }),
+        slowest: slowest.map(function (e) { return [e.name, round(e.duration)]; }),
+        longtasks: tasks.length,
+        longtask_ms: round(tasks.reduce(function (s, t) { return s + t.duration; }, 0))
+    });
+}, observer ? settle : 0);
+"""
+
+
+@dataclass(frozen=True)
+class PerfSample:
+    page: str                      # page object class, e.g. "DashboardPage"
+    action: str                    # load | submit | search | ...
+    url: str
+    navigation: Optional[dict]     # Navigation Timing (ms), first capture on a document only
+    resources: int                 # resources fetched since the previous capture
+    transfer: int                  # bytes over the network for those resources
+    api_ms: Tuple[float, ...]      # fetch / XHR durations
+    slowest: Tuple[Tuple[str, float], ...]
+    longtasks: int
+    longtask_ms: float
+
+
+class PerfRecorder:
+    # Thread-safe collector; capture() is a no-op (no round trip) unless enabled
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.samples = []
+
+    def capture(self, driver, page, action, settle=0.05):
+        if not self.enabled:
+            return None
+        from selenium.common.exceptions import WebDriverException   # imported by the conftest: kept lazy
+
+        try:
+            with phase("interactions"):
+                raw = driver.execute_async_script(_CAPTURE_JS, int(settle * 1000))
+        except WebDriverException:
+            return None   # measuring must never fail a test
+        sample = PerfSample(
+            page=page, action=action, url=raw["url"], navigation=raw["navigation"],
+            resources=raw["resources"], transfer=raw["transfer"], api_ms=tuple(raw["api_ms"]),
+            slowest=tuple((name, ms) for name, ms in raw["slowest"]),
+            longtasks=raw["longtasks"], longtask_ms=raw["longtask_ms"],
+        )
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def since(self, index):
+        # Samples captured after position `index` (per-test slice for the report)
+        with self._lock:
+            return self.samples[index:]
+
+    def mark(self):
+        with self._lock:
+            return len(self.samples)
+
+    def drain(self):
+        with self._lock:
+            samples, self.samples = self.samples, []
+        return samples
+
+    def save_samples(self, path):
+        # Raw samples of this process (parallel worker); utils.parallel aggregates them
+        samples = self.drain()
+        if samples:
+            _write_json(path, [asdict(s) for s in samples])
+
+    def save(self, path=PERF_FILE, run_id=None):
+        append_run(self.drain(), path, run_id)
+
+
+RECORDER = PerfRecorder()
+
+
+# ---- Aggregation ----
+def _stats(values):
+    from utils.waits import percentile
+
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return {"median": round(statistics.median(values), 1), "p95": round(percentile(values, 95), 1)}
+
+
+def aggregate(samples):
+    """(page, action) -> {"n": ..., "metrics": {name: {"median", "p95"}}} for one run."""
+    groups = defaultdict(list)
+    for s in samples:
+        s = s if isinstance(s, dict) else asdict(s)
+        groups[(s["page"], s["action"])].append(s)
+
+    out = {}
+    for key, group in groups.items():
+        navs = [s["navigation"] for s in group if s["navigation"]]
+        metrics = {
+            name: _stats([n[name] for n in navs])
+            for name in ("ttfb", "response", "redirect", "dom_content_loaded", "load")
+        }
+        metrics.update({
+            "resources": _stats([s["resources"] for s in group]),
+            "transfer_kb": _stats([s["transfer"] / 1024 for s in group]),
+            "api_ms": _stats([ms for s in group for ms in s["api_ms"]]),
+            "longtask_ms": _stats([s["longtask_ms"] for s in group]),
+        })
+        out[key] = {"n": len(group), "metrics": {k: v for k, v in metrics.items() if v}}
+    return out
+
+
+def append_run(samples, path=PERF_FILE, run_id=None):
+    # One JSON line per (page, action) of this run
+    if not samples:
+        return
+    run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(path, "a", encoding="utf-8") as f:
+        for (page, action), agg in sorted(aggregate(samples).items()):
+            f.write(json.dumps({"run": run_id, "time": stamp, "page": page, "action": action, **agg},
+                               separators=(",", ":")) + "\n")
+
+
+def load_samples(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def load_history(path=PERF_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+# ---- Trend report ----
+def trend(history, metric, runs=10):
+    # (page, action) -> [(run, median)] of the last `runs` runs, oldest first
+    series = defaultdict(list)
+    for line in history:
+        value = line["metrics"].get(metric)
+        if value:
+            series[(line["page"], line["action"])].append((line["run"], value["median"]))
+    return {key: points[-runs:] for key, points in series.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Xu hướng hiệu năng OrangeHRM theo từng lần chạy")
+    parser.add_argument("--metric", default="load", help="ttfb | load | redirect | api_ms | longtask_ms | ...")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    series = trend(load_history(), args.metric, args.runs)
+    if not series:
+        print(f"No '{args.metric}' samples in {PERF_FILE} (run pytest --perf)")
+        return 0
+    for (page, action), points in sorted(series.items()):
+        values = [v for _, v in points]
+        flag = ""
+        if len(values) > 1 and values[-1] > statistics.median(values[:-1]) * REGRESSION_RATIO:
+            flag = "  <-- slower"
+        print(f"{page}.{action:14} {args.metric}: " + " ".join(f"{v:7.1f}" for v in values) + flag)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,163 @@
+"""
+Kết quả test có cấu trúc, thay cho report.txt ghi từng dòng.
+
+- Mỗi test được chia thời gian theo phase (exclusive time, phase lồng nhau không bị tính hai lần):
+  driver_startup, navigation, login, waits, interactions, body, teardown
+  (body: phần còn lại của thân test, ngoài các phase khác: assert, tính toán, sleep...)
+- Mỗi thread có stack phase riêng: phase mở từ thread pool trong test không lồng nhầm
+  vào phase của thread chính; thời gian của các thread được cộng dồn (có thể > wall time)
+- Kết quả được giữ trong bộ nhớ và ghi một lần, atomic, lúc kết thúc session:
+  report.json + report.xml (JUnit)
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ("driver_startup", "navigation", "login", "waits", "interactions", "body", "teardown")
+
+
+class PhaseTimer:
+    # Exclusive time per phase for one test; nested phases are subtracted from their parent
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self._local = threading.local()   # per-thread stack of [name, start, child_time]
+        self._lock = threading.Lock()     # guards totals only
+
+    @property
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        stack = self._stack
+        name, start, child = stack.pop()
+        elapsed = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += elapsed
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0.0) + elapsed - child
+
+
+_current = None
+
+
+def start_test():
+    # Begin phase accounting for a new test
+    global _current
+    _current = PhaseTimer()
+    return _current
+
+
+def current():
+    return _current
+
+
+@contextmanager
+def phase(name):
+    # Attribute the time spent in the block to `name` for the running test (no-op outside a test)
+    timer = _current
+    if timer is None:
+        yield
+        return
+    timer.enter(name)
+    try:
+        yield
+    finally:
+        timer.exit()
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class ResultsSink:
+    # In-memory buffer of test results, flushed once at session end
+
+    def __init__(self):
+        self.results = {}
+        self.started = time.time()
+
+    def add(self, nodeid, name, outcome, duration, phases, message="", properties=None):
+        self.results[nodeid] = {
+            "nodeid": nodeid,
+            "name": name,
+            "outcome": outcome,
+            "duration": round(duration, 4),
+            "phases": {k: round(v, 4) for k, v in phases.items()},
+            "message": message,
+            "properties": properties or {},
+        }
+
+    def summary(self):
+        rows = list(self.results.values())
+        counts = {}
+        for row in rows:
+            counts[row["outcome"]] = counts.get(row["outcome"], 0) + 1
+        phases = dict.fromkeys(PHASES, 0.0)
+        for row in rows:
+            for k, v in row["phases"].items():
+                phases[k] = round(phases.get(k, 0.0) + v, 4)
+        return {"tests": len(rows), "outcomes": counts, "phases": phases,
+                "duration": round(sum(r["duration"] for r in rows), 4)}
+
+    def write(self, json_path, junit_path=None):
+        data = {"started": self.started, "finished": time.time(),
+                "summary": self.summary(), "tests": list(self.results.values())}
+        _write_atomic(json_path, json.dumps(data, indent=2, ensure_ascii=False, default=str))
+        if junit_path:
+            _write_atomic(junit_path, to_junit(data))
+
+
+def load(json_path):
+    with open(json_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def merge(reports):
+    # Combine several report.json payloads (parallel workers) into one
+    sink = ResultsSink()
+    sink.started = min((r["started"] for r in reports), default=time.time())
+    for report in reports:
+        for row in report["tests"]:
+            sink.results[row["nodeid"]] = row
+    return sink
+
+
+def to_junit(data):
+    # xml.sax.saxutils pulls in urllib.request: only import it once a report is written
+    from xml.sax.saxutils import escape, quoteattr
+
+    summary = data["summary"]
+    failures = summary["outcomes"].get("failed", 0)
+    skipped = summary["outcomes"].get("skipped", 0)
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             f'<testsuite name="orangehrm_demo" tests="{summary["tests"]}" failures="{failures}" '
+             f'skipped="{skipped}" time="{summary["duration"]}">']
+    for row in data["tests"]:
+        classname, _, name = row["nodeid"].rpartition("::")
+        lines.append(f'  <testcase classname={quoteattr(classname.replace("::", "."))} '
+                     f'name={quoteattr(name)} time="{row["duration"]}">')
+        lines.append("    <properties>")
+        for key, value in row["phases"].items():
+            lines.append(f'      <property name={quoteattr("phase." + key)} value="{value}"/>')
+        for key, value in row["properties"].items():
+            lines.append(f'      <property name={quoteattr(key)} value={quoteattr(str(value))}/>')
+        lines.append("    </properties>")
+        if row["outcome"] == "failed":
+            lines.append(f'    <failure message={quoteattr(row["message"][:200])}>{escape(row["message"])}</failure>')
+        elif row["outcome"] == "skipped":
+            lines.append(f'    <skipped message={quoteattr(row["message"][:200])}/>')
+        lines.append("  </testcase>")
+    lines.append("</testsuite>")
+    return "\n".join(lines) + "\n"
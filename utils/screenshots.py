@@ -0,0 +1,165 @@
+"""
+Screenshot pipeline chạy nền: teardown chỉ lấy bytes PNG từ browser rồi đưa vào queue,
+thread ghi nén / thu nhỏ ảnh và lưu theo content hash (ảnh trùng chỉ lưu một lần).
+
+    screenshots/store/<hash[:2]>/<hash>.png   # content-addressed store
+    screenshots/runs/<run_id>.json            # index của một lần chạy: test -> file
+                                              # (hoặc {"file", "regions"} nếu có vùng động)
+    screenshots/runs/<run_id>.<worker>.json   # utils.parallel: một index cho mỗi worker
+
+Vùng động (chart, giờ...) gửi kèm ảnh được đổi sang toạ độ của ảnh đã thu nhỏ trước khi
+ghi vào index, để utils.visual mask đúng chỗ trên ảnh trong kho.
+
+Chỉ giữ index của KEEP_RUNS lần chạy gần nhất (theo run id, mọi worker của một lần chạy
+song song tính là một); file không còn được index nào
+trỏ tới sẽ bị xoá để thư mục không phình mãi.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import queue
+import threading
+import time
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow là tuỳ chọn: không có thì lưu PNG gốc
+    Image = None
+
+KEEP_RUNS = 20
+_STOP = object()
+
+
+def scale_regions(regions, scale):
+    # Rectangles rounded outwards, so a downscaled region still covers the whole element
+    out = []
+    for x, y, w, h in regions:
+        left, top = math.floor(x * scale), math.floor(y * scale)
+        out.append([left, top, math.ceil((x + w) * scale) - left, math.ceil((y + h) * scale) - top])
+    return out
+
+
+def entry_file(entry):
+    # Run index value -> store path (plain string, or {"file", "regions"})
+    return entry["file"] if isinstance(entry, dict) else entry
+
+
+def entry_regions(entry):
+    return entry.get("regions", []) if isinstance(entry, dict) else []
+
+
+class ScreenshotWriter:
+
+    def __init__(self, root, run_id=None, worker=None, max_queue=16, max_width=1280, keep_runs=KEEP_RUNS):
+        self.root = root
+        self.store_dir = os.path.join(root, "store")
+        self.runs_dir = os.path.join(root, "runs")
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S")
+        # Index file name; workers of one parallel run share the run id
+        self.index_name = f"{self.run_id}.{worker}" if worker else self.run_id
+        self.max_width = max_width
+        self.keep_runs = keep_runs
+        self.index = {}
+        self.stats = {"submitted": 0, "stored": 0, "deduplicated": 0, "failed": 0, "bytes_in": 0, "bytes_out": 0}
+        self.errors = []   # (test name, error) of screenshots that could not be saved
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+
+    # ---- Lifecycle ----
+    def start(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        os.makedirs(self.runs_dir, exist_ok=True)
+        self._thread.start()
+        return self
+
+    def submit(self, name, png, regions=()):
+        # Hand raw PNG bytes to the writer thread (blocks only when the queue is full);
+        # `regions`: (x, y, w, h) in pixels of `png`, ignored by visual diffs
+        self.stats["submitted"] += 1
+        self._queue.put((name, png, regions))
+
+    def close(self, prune=True):
+        # Flush the queue, write this run's index, drop old runs
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.index:
+            path = os.path.join(self.runs_dir, f"{self.index_name}.json")
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.index, f, indent=1, ensure_ascii=False)
+            os.replace(tmp, path)
+        if prune:
+            self.prune()
+
+    # ---- Writer thread ----
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            name, png, regions = item
+            try:
+                data, scale = self._compress(png)
+                rel = self._store(data)
+                self.index[name] = {"file": rel, "regions": scale_regions(regions, scale)} if regions else rel
+            except Exception as exc:   # never kill the thread on one bad image; reported at the end
+                self.stats["failed"] += 1
+                self.errors.append((name, f"{type(exc).__name__}: {exc}"))
+
+    def _compress(self, png):
+        # (stored bytes, stored width / original width)
+        self.stats["bytes_in"] += len(png)
+        if Image is None:
+            return png, 1.0
+        image = Image.open(io.BytesIO(png))
+        scale = 1.0
+        if self.max_width and image.width > self.max_width:
+            scale = self.max_width / image.width
+            height = round(image.height * scale)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        # Palette PNG: far smaller, and near-identical frames collapse to the same bytes more often
+        image = image.convert("RGB").quantize(colors=256)
+        out = io.BytesIO()
+        image.save(out, format="PNG", optimize=True)
+        return out.getvalue(), scale
+
+    def _store(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        rel = os.path.join("store", digest[:2], f"{digest}.png")
+        path = os.path.join(self.root, rel)
+        if os.path.exists(path):
+            self.stats["deduplicated"] += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Per-process temp name: parallel workers may store the same content at once
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.stats["stored"] += 1
+            self.stats["bytes_out"] += len(data)
+        return rel.replace(os.sep, "/")
+
+    # ---- Retention ----
+    def prune(self):
+        # Keep the indexes of the newest `keep_runs` runs and the store files they reference;
+        # the per-worker indexes of a parallel run count as one run
+        indexes = [f for f in os.listdir(self.runs_dir) if f.endswith(".json")]
+        run_ids = sorted({f.split(".", 1)[0] for f in indexes})
+        stale = set(run_ids[:-self.keep_runs]) if self.keep_runs else set(run_ids)
+        for old in indexes:
+            if old.split(".", 1)[0] in stale:
+                os.remove(os.path.join(self.runs_dir, old))
+
+        referenced = set()
+        for run in os.listdir(self.runs_dir):
+            if run.endswith(".json"):
+                with open(os.path.join(self.runs_dir, run), encoding="utf-8") as f:
+                    referenced.update(entry_file(v) for v in json.load(f).values())
+        for dirpath, _, files in os.walk(self.store_dir):
+            for name in files:
+                rel = os.path.relpath(os.path.join(dirpath, name), self.root).replace(os.sep, "/")
+                if rel not in referenced:
+                    os.remove(os.path.join(dirpath, name))
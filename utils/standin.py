@@ -0,0 +1,367 @@
+"""
+Stand-in OrangeHRM chạy local: ghi lại (record) rồi phát lại (replay) các trang,
+XHR và asset mà flow login / dashboard dùng tới.
+
+    python -m utils.standin record            # chạy flow trên trang demo, lưu vào standin_capture/
+    python -m utils.standin serve --port 8080 # phát lại bản đã ghi trên localhost
+
+    pytest --standin                          # chạy cả suite với server in-process
+    pytest --standin-capture /data/capture    # ... với bản ghi ở thư mục khác
+
+Bản ghi không commit (standin_capture/ nằm trong .gitignore): nội dung trang demo đổi
+theo phiên bản OrangeHRM, nên mỗi máy / CI ghi một lần trước khi dùng --standin:
+1. Cần Chrome + mạng tới trang demo (config.DEMO_BASE_URL, tài khoản ADMIN_* trong config)
+2. python -m utils.standin record [--dir <thư mục>]   (~1 phút, ghi đè bản cũ)
+3. Ghi lại khi trang demo nâng cấp (test --standin lỗi 404 "Not recorded: ...")
+Máy không có mạng / Chrome: chép thư mục bản ghi từ máy khác rồi trỏ tới bằng
+--standin-capture PATH (pytest, utils.load), serve --dir PATH hoặc biến môi trường
+ORANGEHRM_STANDIN_CAPTURE.
+
+Server tự xử lý phần có trạng thái:
+- POST /auth/validate: đúng tài khoản -> set session cookie + redirect dashboard,
+  sai -> redirect về login kèm trang lỗi "Invalid credentials" đã ghi
+- Trang / API cần đăng nhập mà không có cookie -> redirect về login
+- "Required" là validate phía client, chạy bằng JS đã ghi
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from utils import config
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAPTURE_DIR = os.environ.get("ORANGEHRM_STANDIN_CAPTURE") or os.path.join(ROOT_DIR, "standin_capture")
+
+LOGIN_PATH = "/web/index.php/auth/login"
+VALIDATE_PATH = "/web/index.php/auth/validate"
+LOGOUT_PATH = "/web/index.php/auth/logout"
+DASHBOARD_PATH = "/web/index.php/dashboard/index"
+
+SESSION_COOKIE = "orangehrm"
+FLASH_COOKIE = "standin_flash"
+
+# Login page variant recorded after a failed login ("Invalid credentials")
+ERROR_VARIANT = "error"
+
+# Paths served without a session (login page + static assets)
+_PUBLIC_PREFIXES = (LOGIN_PATH, VALIDATE_PATH, LOGOUT_PATH, "/web/dist/", "/web/images/", "/favicon")
+
+_TEXT_TYPES = ("text/", "application/json", "application/javascript", "application/x-javascript", "image/svg+xml")
+
+
+def rewrite_origin(body, recorded, origin):
+    # Absolute URLs of the recorded site -> this server, plain and JSON-escaped
+    # ("https:\/\/host" in Vue props and API payloads)
+    for old, new in ((recorded, origin), (recorded.replace("/", "\\/"), origin.replace("/", "\\/"))):
+        body = body.replace(old.encode(), new.encode())
+    return body
+
+
+# Wait until no new resource entry has appeared for `quiet` ms (network settled)
+_NETWORK_IDLE_JS = """
+var quiet = arguments[0], done = arguments[arguments.length - 1];
+var last = -1, stableSince = Date.now();
+(function poll() {
+    var n = performance.getEntriesByType('resource').length;
+    if (n !== last) { last = n; stableSince = Date.now(); }
+    if (document.readyState === 'complete' && Date.now() - stableSince >= quiet) done(n);
+    else setTimeout(poll, 100);
+})();
+"""
+
+
+def request_key(method, path, query=""):
+    return f"{method} {path}?{query}" if query else f"{method} {path}"
+
+
+# =====================
+# Capture store
+# =====================
+class Capture:
+    # index.json: key -> {variant: {status, content_type, body (file name)}}
+
+    def __init__(self, directory=CAPTURE_DIR):
+        self.directory = directory
+        self.index = {}
+        path = os.path.join(directory, "index.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def add(self, key, status, content_type, body, variant="default"):
+        digest = hashlib.sha1(body).hexdigest()
+        body_dir = os.path.join(self.directory, "bodies")
+        os.makedirs(body_dir, exist_ok=True)
+        with open(os.path.join(body_dir, digest), "wb") as f:
+            f.write(body)
+        self.index.setdefault(key, {})[variant] = {"status": status, "content_type": content_type, "body": digest}
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "index.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+    def lookup(self, method, path, query, variant="default"):
+        # Exact match first, then the same path with any recorded query
+        entry = self.index.get(request_key(method, path, query)) or self.index.get(request_key(method, path))
+        if entry is None:
+            prefix = request_key(method, path) + "?"
+            entry = next((v for k, v in self.index.items() if k.startswith(prefix)), None)
+        if entry is None:
+            return None
+        return entry.get(variant) or entry.get("default") or next(iter(entry.values()))
+
+    def body(self, record):
+        with open(os.path.join(self.directory, "bodies", record["body"]), "rb") as f:
+            return f.read()
+
+
+# =====================
+# Record
+# =====================
+class Recorder:
+    """
+    Chạy flow login / dashboard trên trang thật bằng Chrome có bật performance log,
+    lấy body của từng response qua CDP Network.getResponseBody.
+    """
+
+    def __init__(self, driver, capture, origin=config.DEMO_BASE_URL):
+        self.driver = driver
+        self.capture = capture
+        self.origin = origin
+        self.count = 0
+
+    def drain(self, variant="default"):
+        # Read pending performance-log events and store every same-origin response.
+        # A non-default variant only keeps documents (assets are shared).
+        self.driver.execute_async_script(_NETWORK_IDLE_JS, 500)
+        messages = [json.loads(entry["message"])["message"] for entry in self.driver.get_log("performance")]
+        methods = {m["params"]["requestId"]: m["params"]["request"]["method"]
+                   for m in messages if m.get("method") == "Network.requestWillBeSent"}
+
+        for message in messages:
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message["params"]
+            if variant != "default" and params.get("type") != "Document":
+                continue
+            response = params["response"]
+            parts = urlsplit(response["url"])
+            if f"{parts.scheme}://{parts.netloc}" != self.origin:
+                continue
+            try:
+                result = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+            except Exception:
+                continue   # body evicted / no body (redirect, 204)
+            body = base64.b64decode(result["body"]) if result.get("base64Encoded") else result["body"].encode("utf-8")
+            method = methods.get(params["requestId"], "GET")
+            content_type = response.get("mimeType") or response.get("headers", {}).get("content-type", "")
+            self.capture.add(request_key(method, parts.path, parts.query), response["status"], content_type, body, variant)
+            self.count += 1
+
+    def run(self):
+        from pages.dashboard_page import DashboardPage
+        from pages.login_page import LoginPage
+
+        driver = self.driver
+        driver.execute_cdp_cmd("Network.enable", {})
+
+        # Login page
+        driver.get(self.origin + LOGIN_PATH)
+        LoginPage(driver).is_login_button_displayed()
+        self.drain()
+
+        # Failed login -> login page rendered with "Invalid credentials"
+        login = LoginPage(driver)
+        login.enter_username("WrongUser")
+        login.enter_password("wrongpass")
+        login.click_login()
+        LoginPage(driver).get_error_message()
+        self.drain(ERROR_VARIANT)
+
+        # Successful login -> dashboard + widget XHRs
+        login = LoginPage(driver)
+        login.enter_username(config.ADMIN_USERNAME)
+        login.enter_password(config.ADMIN_PASSWORD)
+        login.click_login()
+        dashboard = DashboardPage(driver)
+        dashboard.snapshot()
+        self.drain()
+
+        # Pages behind the Quick Launch / Time at Work / My Actions buttons
+        for locator in (DashboardPage.QUICK_BTN, DashboardPage.TIME_BTN, DashboardPage.MY_ACTION_ITEMS):
+            for i in range(len(dashboard.wait.elements(locator))):
+                dashboard.wait.elements(locator)[i].click()
+                self.drain()
+                dashboard.back()
+                dashboard.snapshot()
+                self.drain()
+
+        self.capture.save()
+        return self.count
+
+
+def record(driver_path, directory=CAPTURE_DIR):
+    from selenium.webdriver.chrome.options import Options
+
+    from utils.browser import create_chrome
+
+    options = Options()
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = create_chrome(driver_path, options)
+    try:
+        return Recorder(driver, Capture(directory)).run()
+    finally:
+        driver.quit()
+
+
+# =====================
+# Replay
+# =====================
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "OrangeHRM-Standin/1.0"
+
+    def log_message(self, fmt, *args):
+        pass   # keep the pytest output clean
+
+    # ---- Helpers ----
+    def _cookies(self):
+        jar = SimpleCookie(self.headers.get("Cookie", ""))
+        return {k: m.value for k, m in jar.items()}
+
+    def _redirect(self, location, cookies=()):
+        self.send_response(302)
+        self.send_header("Location", location)
+        for cookie in cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, status, content_type, body, cookies=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store" if "html" in content_type or "json" in content_type else "max-age=3600")
+        for cookie in cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _serve_recorded(self, method, path, query, variant="default", cookies=()):
+        capture = self.server.capture
+        record_ = capture.lookup(method, path, query, variant)
+        if record_ is None:
+            self._send(404, "text/plain", f"Not recorded: {request_key(method, path, query)}".encode())
+            return
+        body = capture.body(record_)
+        content_type = record_["content_type"] or "application/octet-stream"
+        if content_type.startswith(_TEXT_TYPES):
+            # Recorded absolute URLs point at the demo site: rewrite them to this server
+            body = rewrite_origin(body, self.server.recorded_origin, self.server.origin)
+        self._send(record_["status"], content_type, body, cookies)
+
+    # ---- Methods ----
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path, query = parts.path, parts.query
+        cookies = self._cookies()
+        logged_in = cookies.get(SESSION_COOKIE) == self.server.session_id
+
+        if path in ("/", "/web/index.php", "/web/index.php/"):
+            return self._redirect(DASHBOARD_PATH if logged_in else LOGIN_PATH)
+        if path == LOGOUT_PATH:
+            return self._redirect(LOGIN_PATH, [f"{SESSION_COOKIE}=; Path=/; Max-Age=0"])
+        if path == LOGIN_PATH:
+            if cookies.get(FLASH_COOKIE):
+                return self._serve_recorded("GET", path, query, ERROR_VARIANT, [f"{FLASH_COOKIE}=; Path=/; Max-Age=0"])
+            return self._serve_recorded("GET", path, query)
+        if not logged_in and not path.startswith(_PUBLIC_PREFIXES):
+            if "/api/" in path:
+                return self._send(401, "application/json", b'{"error":{"status":"401","message":"Session expired"}}')
+            return self._redirect(LOGIN_PATH)
+        return self._serve_recorded("GET", path, query)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length).decode("utf-8", "replace")
+
+        if parts.path == VALIDATE_PATH:
+            form = {k: v[0] for k, v in parse_qs(payload, keep_blank_values=True).items()}
+            if form.get("username") == config.ADMIN_USERNAME and form.get("password") == config.ADMIN_PASSWORD:
+                return self._redirect(DASHBOARD_PATH, [f"{SESSION_COOKIE}={self.server.session_id}; Path=/; HttpOnly"])
+            return self._redirect(LOGIN_PATH, [f"{FLASH_COOKIE}=invalid; Path=/"])
+
+        if self._cookies().get(SESSION_COOKIE) != self.server.session_id:
+            return self._send(401, "application/json", b'{"error":{"status":"401","message":"Session expired"}}')
+        return self._serve_recorded("POST", parts.path, parts.query)
+
+    def do_PUT(self):
+        self.do_POST()
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, capture=None, recorded_origin=config.DEMO_BASE_URL):
+        super().__init__(("127.0.0.1", port), StandinHandler)
+        self.capture = capture or Capture()
+        self.recorded_origin = recorded_origin
+        self.origin = f"http://localhost:{self.server_address[1]}"
+        self.session_id = hashlib.sha1(str(time.time()).encode()).hexdigest()
+        self._thread = None
+
+    def start(self):
+        # Serve from a background thread (in-process, for pytest)
+        if not self.capture.index:
+            raise RuntimeError(
+                f"No stand-in capture in {self.capture.directory} (captures are not committed). Record one "
+                f"with network + Chrome: python -m utils.standin record --dir {self.capture.directory}, "
+                f"or point at an existing one: --standin-capture PATH / ORANGEHRM_STANDIN_CAPTURE")
+        self._thread = threading.Thread(target=self.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record the login/dashboard flows from the demo site")
+    rec.add_argument("--dir", default=CAPTURE_DIR)
+    srv = sub.add_parser("serve", help="serve a recorded capture on localhost")
+    srv.add_argument("--dir", default=CAPTURE_DIR)
+    srv.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        from utils.driver_resolver import resolve_chromedriver
+        count = record(resolve_chromedriver().path, args.dir)
+        print(f"Recorded {count} responses into {args.dir}")
+    else:
+        server = StandinServer(args.port, Capture(args.dir))
+        print(f"Serving {len(server.capture.index)} recorded requests on {server.origin}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
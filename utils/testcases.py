@@ -0,0 +1,175 @@
+"""
+Đọc test case từ Testcase/TestCase_OrangehrmDemo.xlsx lúc collect và chuyển thành pytest.param.
+
+Workbook được đọc streaming (openpyxl read_only); kết quả parse lưu ở
+.testcase_cache/<sha256>.json nên lần collect sau chỉ cần hash file, chỉ parse lại
+khi sheet thay đổi.
+
+Mỗi test khai báo bảng binding ID -> giá trị tham số (action của page object,
+expected, ...); tiêu đề và test data lấy từ sheet:
+
+    @pytest.mark.parametrize(ARGS, testcases.params("Dashboard", ARGS, BINDINGS))
+
+page=<page object class> kiểm tra action ngay lúc collect, nhưng kéo selenium vào lúc
+collect; test module dùng pages.<Class> (lazy) thì để action tự báo lỗi lúc chạy.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import time
+
+import pytest
+
+# openpyxl là tuỳ chọn (không có thì chỉ dùng được cache) và chỉ import khi phải parse lại
+HAS_OPENPYXL = importlib.util.find_spec("openpyxl") is not None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKBOOK = os.path.join(ROOT_DIR, "Testcase", "TestCase_OrangehrmDemo.xlsx")
+CACHE_DIR = os.path.join(ROOT_DIR, ".testcase_cache")
+CACHE_VERSION = 1
+STALE_TMP = 600   # seconds before a leftover .tmp cache file counts as abandoned
+
+# Sheet header -> row key
+COLUMNS = {
+    "ID": "ID",
+    "Test Case Name / Title": "case",
+    "Test Data": "data",
+    "Expected Result": "expected",
+    "Actual Result": "actual",
+    "Status Auto": "status",
+}
+
+_QUOTED = re.compile(r'"([^"]+)"')
+_LENGTH = re.compile(r"^(\d+)\s*k[íý]\s*t[ựu]$", re.IGNORECASE)   # "101 kí tự" -> 101 chars
+
+
+# ---- Parsing ----
+def parse_data(text):
+    """'Username: Admin\\nPassword: admin123' -> {'username': 'Admin', 'password': 'admin123'}."""
+    text = (text or "").strip()
+    if not text or text.upper() == "N/A":
+        return {}
+    if text.lower() == "blank":
+        return {"username": "", "password": ""}
+    fields = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(":")
+        if not sep:
+            return {"value": text}   # bare value, e.g. a search keyword
+        value = value.strip()
+        length = _LENGTH.match(value)
+        fields[key.strip().lower()] = "a" * int(length.group(1)) if length else value
+    return fields
+
+
+def _expected(row):
+    # First quoted text of Expected Result, else of Actual Result ("Required" for blank login)
+    for column in ("expected", "actual"):
+        found = _QUOTED.search(row.get(column) or "")
+        if found:
+            return found.group(1)
+    return None
+
+
+def _parse(path):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = [COLUMNS.get(str(h).strip()) if h else None for h in next(rows, ())]
+            cases = []
+            for values in rows:
+                raw = {key: str(v).strip() for key, v in zip(header, values) if key and v is not None}
+                if not raw.get("ID"):
+                    continue
+                cases.append({
+                    "ID": raw["ID"],
+                    "case": raw.get("case", ""),
+                    "expected": _expected(raw),
+                    "status": raw.get("status"),
+                    **parse_data(raw.get("data")),
+                })
+            sheets[sheet.title] = cases
+        return sheets
+    finally:
+        workbook.close()
+
+
+# ---- Cache ----
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load(path=WORKBOOK, cache_dir=CACHE_DIR):
+    """Sheet name -> list of row dicts; None when the workbook cannot be read."""
+    if not os.path.exists(path):
+        return None
+    key = f"{file_hash(path)}-v{CACHE_VERSION}"
+    cache_file = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    if not HAS_OPENPYXL:
+        return None
+
+    sheets = _parse(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(sheets, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, cache_file)
+    _prune(cache_dir, os.path.basename(cache_file))
+    return sheets
+
+
+def _prune(cache_dir, keep):
+    # One entry per workbook version is enough. Other workers may be writing theirs
+    # right now: only finished entries go, and .tmp files left behind by a crash
+    now = time.time()
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            if name.endswith(".json") and name != keep:
+                os.remove(path)
+            elif name.endswith(".tmp") and now - os.path.getmtime(path) > STALE_TMP:
+                os.remove(path)
+        except OSError:
+            pass   # another worker got there first
+
+
+# ---- Parameters ----
+def params(sheet, argnames, bindings, page=None, path=WORKBOOK):
+    """
+    pytest.param list for the rows of `sheet` listed in `bindings` (ID -> dict, or
+    callable(row) -> dict). Binding values override the row's; a "marks" key is
+    applied as pytest marks. Argnames missing from both are passed as None.
+    """
+    sheets = load(path)
+    if sheets is None:
+        reason = "openpyxl is not installed" if not HAS_OPENPYXL else f"{path} not found"
+        return [pytest.param(*[None] * len(argnames), marks=pytest.mark.skip(reason=reason), id=sheet)]
+
+    rows = {row["ID"]: row for row in sheets.get(sheet, [])}
+    result = []
+    for case_id, binding in bindings.items():
+        row = rows.get(case_id)
+        if row is None:
+            continue   # case removed from the sheet
+        values = dict(row)
+        values.update(binding(row) if callable(binding) else binding)
+        if page is not None and values.get("action") and not hasattr(page, values["action"]):
+            raise ValueError(f"{case_id}: {page.__name__} has no action '{values['action']}'")
+        marks = values.pop("marks", ())
+        result.append(pytest.param(*(values.get(name) for name in argnames), marks=marks, id=case_id))
+    return result
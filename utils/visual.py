@@ -0,0 +1,391 @@
+"""
+So sánh ảnh (visual regression) cho kho screenshots/.
+
+    python -m utils.visual index                                 # hash toàn bộ ảnh (có cache)
+    python -m utils.visual accept screenshots/x.png --name dashboard --region 10,200,400,300
+    python -m utils.visual report                                # so ảnh mới nhất với baseline
+
+- Perceptual hash (pHash, DCT 32x32 -> 64 bit) cho mỗi ảnh, cache theo (size, mtime)
+- Tìm baseline gần nhất bằng khoảng cách Hamming, tính vector hoá trên cả mảng hash
+- Diff pixel bằng NumPy, bỏ qua vùng động (chart Time at Work, giờ, ...) qua region mask
+- Baseline lưu ở screenshots/baselines/ (index.json: tên -> file, hash, vùng mask)
+- Vùng động (DashboardPage.DYNAMIC_REGIONS) được ghi cùng screenshot lúc chụp (toạ độ
+  của ảnh đã thu nhỏ trong kho); accept và report tự mask chúng, --region chỉ để thêm vùng
+
+Cần numpy + Pillow (không bắt buộc cho phần còn lại của suite).
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from utils.screenshots import entry_file, entry_regions
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # numpy / Pillow là tuỳ chọn: chỉ cần khi dùng module này
+    np = None
+    Image = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCREENSHOT_DIR = os.path.join(ROOT_DIR, "screenshots")
+BASELINE_DIR = os.path.join(SCREENSHOT_DIR, "baselines")
+INDEX_FILE = os.path.join(ROOT_DIR, ".visual_index.json")
+REPORT_DIR = os.path.join(SCREENSHOT_DIR, "visual_report")
+
+HASH_SIZE = 32          # image is reduced to 32x32 before the DCT
+LOW_FREQ = 8            # 8x8 lowest frequencies -> 64-bit hash
+NEAR_DISTANCE = 10      # max Hamming distance for "same screen" when no baseline has the name
+PIXEL_TOLERANCE = 16    # per-channel difference ignored (anti-aliasing, compression)
+DIFF_THRESHOLD = 0.002  # changed share of unmasked pixels that fails the comparison
+
+# Bits set in each byte value, for popcount over uint64 arrays viewed as bytes
+_POPCOUNT = None
+
+
+def _require():
+    if np is None:
+        raise RuntimeError("utils.visual needs numpy and Pillow: pip install numpy Pillow")
+
+
+# ---- Perceptual hash ----
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT = None
+
+
+def phash(image):
+    # 64-bit pHash of a PIL image: low-frequency DCT coefficients above their median
+    global _DCT
+    _require()
+    if _DCT is None:
+        _DCT = _dct_matrix(HASH_SIZE)
+    pixels = np.asarray(image.convert("L").resize((HASH_SIZE, HASH_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (_DCT @ pixels @ _DCT.T)[:LOW_FREQ, :LOW_FREQ]
+    bits = low > np.median(low.ravel()[1:])   # DC term excluded from the median
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+def hamming(query, hashes):
+    """Hamming distances between hash(es) and an array of hashes.
+
+    query: int -> shape (N,); sequence of Q ints -> shape (Q, N).
+    """
+    global _POPCOUNT
+    _require()
+    if _POPCOUNT is None:
+        _POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1).astype(np.uint8)
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    single = isinstance(query, int)
+    q = np.asarray([query] if single else query, dtype=np.uint64)
+    xor = q[:, None] ^ hashes[None, :]
+    dist = _POPCOUNT[xor.view(np.uint8)].reshape(xor.shape + (8,)).sum(-1, dtype=np.uint16)
+    return dist[0] if single else dist
+
+
+# ---- Hash index (corpus) ----
+class HashIndex:
+    """
+    pHash of every image in the corpus; re-hashes only files whose size / mtime changed.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = path
+        self.entries = {}   # rel path -> [size, mtime_ns, hash hex]
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def update(self, paths, workers=8):
+        # Hash new / changed files (PNG decoding runs outside the GIL, so threads help)
+        stale = []
+        for path in paths:
+            rel = os.path.relpath(path, ROOT_DIR).replace(os.sep, "/")
+            st = os.stat(path)
+            entry = self.entries.get(rel)
+            if not entry or entry[:2] != [st.st_size, st.st_mtime_ns]:
+                stale.append((rel, path, st))
+
+        def compute(item):
+            rel, path, st = item
+            with Image.open(path) as image:
+                return rel, [st.st_size, st.st_mtime_ns, f"{phash(image):016x}"]
+
+        _require()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for rel, entry in pool.map(compute, stale):
+                self.entries[rel] = entry
+        return len(stale)
+
+    def hashes(self, rels):
+        return np.array([int(self.entries[rel][2], 16) for rel in rels], dtype=np.uint64)
+
+    def save(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def corpus(root=SCREENSHOT_DIR, regions=None):
+    """Latest screenshot per test name: name -> absolute path.
+
+    Top-level PNGs (older runs), then the content-addressed store via run indexes,
+    newest run last so it wins. If `regions` is a dict, it is filled with
+    name -> dynamic regions recorded at capture time (image coordinates).
+    """
+    images = {}
+    recorded = {} if regions is None else regions
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else ():
+        if name.endswith(".png"):
+            images[name[:-4]] = os.path.join(root, name)
+    runs_dir = os.path.join(root, "runs")
+    if os.path.isdir(runs_dir):
+        for run in sorted(f for f in os.listdir(runs_dir) if f.endswith(".json")):
+            with open(os.path.join(runs_dir, run), encoding="utf-8") as f:
+                for name, entry in json.load(f).items():
+                    path = os.path.join(root, entry_file(entry))
+                    if os.path.exists(path):
+                        images[name] = path
+                        recorded[name] = entry_regions(entry)
+    return images
+
+
+# ---- Baselines ----
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "baseline"
+
+
+class Baselines:
+    # screenshots/baselines/index.json: name -> {"file", "phash", "regions": [[x, y, w, h], ...]}
+
+    def __init__(self, directory=BASELINE_DIR):
+        self.directory = directory
+        self.index_file = os.path.join(directory, "index.json")
+        try:
+            with open(self.index_file, encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def accept(self, name, image, regions=()):
+        # Store `image` (PIL) as the baseline for `name`, with its dynamic regions masked
+        _require()
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"{_slug(name)}.png"
+        image.convert("RGB").save(os.path.join(self.directory, filename), optimize=True)
+        self.index[name] = {"file": filename, "phash": f"{phash(image):016x}",
+                            "regions": [list(map(int, r)) for r in regions]}
+        tmp = f"{self.index_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_file)
+
+    def path(self, name):
+        return os.path.join(self.directory, self.index[name]["file"])
+
+    def nearest(self, hashes, max_distance=NEAR_DISTANCE):
+        # For each query hash: closest baseline name (None if none within max_distance)
+        names = list(self.index)
+        if not names or not len(hashes):
+            return [(None, None)] * len(hashes)
+        base = np.array([int(self.index[n]["phash"], 16) for n in names], dtype=np.uint64)
+        dist = hamming(list(map(int, hashes)), base)
+        best = dist.argmin(axis=1)
+        return [(names[j], int(dist[i, j])) if dist[i, j] <= max_distance else (None, int(dist[i, j]))
+                for i, j in enumerate(best)]
+
+
+# ---- Pixel diff ----
+@dataclass(frozen=True)
+class VisualDiff:
+    name: str
+    baseline: Optional[str]             # baseline name compared against (None: no baseline)
+    distance: Optional[int]             # pHash Hamming distance
+    ratio: Optional[float]              # changed share of unmasked pixels
+    bbox: Optional[Tuple[int, int, int, int]]   # x, y, w, h of the changed area
+    size_mismatch: bool = False
+
+    @property
+    def failed(self):
+        return self.size_mismatch or (self.ratio is not None and self.ratio > DIFF_THRESHOLD)
+
+
+def region_mask(shape, regions):
+    # True where pixels are compared; each region (x, y, w, h) is ignored
+    mask = np.ones(shape[:2], dtype=bool)
+    for x, y, w, h in regions:
+        mask[max(0, y):max(0, y + h), max(0, x):max(0, x + w)] = False
+    return mask
+
+
+def pixel_diff(baseline, candidate, regions=(), tolerance=PIXEL_TOLERANCE):
+    """(changed ratio, bbox, changed-pixel mask) of two equally sized RGB uint8 arrays."""
+    delta = np.abs(baseline.astype(np.int16) - candidate.astype(np.int16)).max(axis=2)
+    mask = region_mask(baseline.shape, regions)
+    changed = (delta > tolerance) & mask
+    compared = int(mask.sum())
+    ratio = float(changed.sum()) / compared if compared else 0.0
+    bbox = None
+    if changed.any():
+        ys, xs = np.nonzero(changed)
+        bbox = (int(xs.min()), int(ys.min()), int(xs.max() - xs.min() + 1), int(ys.max() - ys.min() + 1))
+    return ratio, bbox, changed
+
+
+def _rgb(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+def _write_diff(path, candidate, changed, regions):
+    # Candidate dimmed, changed pixels red, masked regions blue
+    out = (candidate * 0.4).astype(np.uint8)
+    ignored = ~region_mask(candidate.shape, regions)
+    out[ignored] = (out[ignored] * 0.5 + np.array([0, 0, 120])).astype(np.uint8)
+    out[changed] = (255, 0, 0)
+    Image.fromarray(out).save(path, optimize=True)
+
+
+def compare(name, path, baselines, match, report_dir=None, regions=()):
+    # Diff one corpus image against its baseline (by name, else nearest by pHash);
+    # `regions`: dynamic regions recorded with the candidate, masked on top of the baseline's
+    baseline, distance = match
+    if baseline is None:
+        return VisualDiff(name, None, distance, None, None)
+    entry = baselines.index[baseline]
+    base, cand = _rgb(baselines.path(baseline)), _rgb(path)
+    if base.shape != cand.shape:
+        return VisualDiff(name, baseline, distance, None, None, size_mismatch=True)
+    masked = list(entry["regions"]) + list(regions)
+    ratio, bbox, changed = pixel_diff(base, cand, masked)
+    result = VisualDiff(name, baseline, distance, round(ratio, 5), bbox)
+    if report_dir and result.failed:
+        os.makedirs(report_dir, exist_ok=True)
+        _write_diff(os.path.join(report_dir, f"{_slug(name)}.diff.png"), cand, changed, masked)
+    return result
+
+
+def report(root=SCREENSHOT_DIR, baselines=None, index=None, report_dir=REPORT_DIR, workers=8):
+    """Compare the latest screenshot of every test with its baseline; list of VisualDiff."""
+    _require()
+    baselines = baselines or Baselines()
+    index = index or HashIndex()
+    recorded = {}
+    images = corpus(root, recorded)
+    index.update(images.values(), workers)
+    index.save()
+
+    names = list(images)
+    rels = [os.path.relpath(images[n], ROOT_DIR).replace(os.sep, "/") for n in names]
+    hashes = index.hashes(rels)
+    nearest = baselines.nearest(hashes)
+    matches = []
+    for i, name in enumerate(names):
+        if name in baselines.index:
+            own = int(hamming(int(hashes[i]), [int(baselines.index[name]["phash"], 16)])[0])
+            matches.append((name, own))
+        else:
+            matches.append(nearest[i])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda i: compare(names[i], images[names[i]], baselines, matches[i], report_dir,
+                                                 recorded.get(names[i], ())),
+                                range(len(names))))
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+        with open(os.path.join(report_dir, "report.json"), "w", encoding="utf-8") as f:
+            json.dump([{**asdict(r), "failed": r.failed} for r in results], f, indent=1)
+    return results
+
+
+# ---- Regions from a live page ----
+def element_regions(driver, locators):
+    # Rectangles (x, y, w, h) of every element matching `locators`, in pixels of the raw
+    # get_screenshot_as_png() image (device pixels); ScreenshotWriter rescales them when
+    # it downscales the image
+    from pages.base_page import FIND_JS
+    return driver.execute_script(FIND_JS + """
+var ratio = window.devicePixelRatio || 1, out = [];
+arguments[0].forEach(function (l) {
+    find(l).forEach(function (el) {
+        var r = el.getBoundingClientRect();
+        out.push([r.left, r.top, r.width, r.height].map(function (v) { return Math.round(v * ratio); }));
+    });
+});
+return out;
+""", [list(loc) for loc in locators])
+
+
+def dynamic_regions(driver):
+    # Regions of every page object's DYNAMIC_REGIONS present on the current page
+    from pages.dashboard_page import DashboardPage
+    return element_regions(driver, DashboardPage.DYNAMIC_REGIONS)
+
+
+# ---- CLI ----
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="hash every screenshot (cached)")
+    acc = sub.add_parser("accept", help="store an image as the baseline of a test name")
+    acc.add_argument("image")
+    acc.add_argument("--name", help="test name (default: file name)")
+    acc.add_argument("--region", action="append", default=[], help="x,y,w,h ignored when diffing (repeatable)")
+    rep = sub.add_parser("report", help="diff the latest screenshots against their baselines")
+    rep.add_argument("--out", default=REPORT_DIR)
+    args = parser.parse_args(argv)
+
+    _require()
+    start = time.perf_counter()
+    if args.command == "index":
+        index = HashIndex()
+        images = corpus()
+        changed = index.update(images.values())
+        index.save()
+        print(f"{len(images)} screenshots indexed ({changed} hashed) in {time.perf_counter() - start:.2f}s")
+    elif args.command == "accept":
+        name = args.name or os.path.splitext(os.path.basename(args.image))[0]
+        regions = [tuple(int(v) for v in r.split(",")) for r in args.region]
+        # An image from the corpus brings the dynamic regions recorded when it was captured
+        recorded = {}
+        for test, path in corpus(regions=recorded).items():
+            if os.path.samefile(path, args.image):
+                regions = [tuple(r) for r in recorded[test]] + regions
+                break
+        with Image.open(args.image) as image:
+            Baselines().accept(name, image, regions)
+        print(f"Baseline '{name}' saved ({len(regions)} masked regions)")
+    else:
+        results = report(report_dir=args.out)
+        failed = [r for r in results if r.failed]
+        for r in sorted(results, key=lambda r: (not r.failed, r.name)):
+            if r.baseline is None:
+                status = "no baseline"
+            elif r.size_mismatch:
+                status = "FAIL size differs"
+            else:
+                status = f"{'FAIL' if r.failed else 'ok  '} {r.ratio * 100:6.2f}% changed"
+            print(f"{status:24} d={r.distance if r.distance is not None else '-':>2}  {r.name}"
+                  + (f"  (vs {r.baseline})" if r.baseline and r.baseline != r.name else ""))
+        print(f"{len(results)} screenshots, {len(failed)} failed, {time.perf_counter() - start:.2f}s; "
+              f"diffs in {args.out}")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
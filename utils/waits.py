@@ -0,0 +1,309 @@
+"""
+Wait engine dùng chung cho mọi page object (thay implicit wait + WebDriverWait rải rác).
+
+- Timeout / polling interval cấu hình theo từng locator
+- Ghi lại thời gian chờ thực tế và số lần poll của mỗi lần chờ
+- Gợi ý timeout từ p99 của lịch sử:  python -m utils.waits
+"""
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.results import phase
+
+# --- MutationObserver trong trang, chạy qua execute_async_script ---
+# Trả về ngay khi DOM đổi, không cần poll / sleep
+_CLASS_TOGGLE_JS = """
+var el = arguments[0], cls = arguments[1], want = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var has = function () { return el.classList.contains(cls); };
+if (has() === want) { done({ok: true, mutations: 0}); return; }
+var count = 0, hard;
+var obs = new MutationObserver(function () {
+    count++;
+    if (has() === want) { obs.disconnect(); clearTimeout(hard); done({ok: true, mutations: count}); }
+});
+obs.observe(el, {attributes: true, attributeFilter: ['class']});
+hard = setTimeout(function () { obs.disconnect(); done({ok: has() === want, mutations: count}); }, timeout);
+"""
+
+_CHILDREN_SETTLED_JS = """
+var el = arguments[0], sel = arguments[1], quiet = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+var count = 0, timer, hard, obs;
+var finish = function (ok) {
+    obs.disconnect(); clearTimeout(timer); clearTimeout(hard);
+    done({ok: ok, mutations: count, items: el.querySelectorAll(sel).length});
+};
+obs = new MutationObserver(function () {
+    count++;
+    clearTimeout(timer);
+    timer = setTimeout(function () { finish(true); }, quiet);
+});
+obs.observe(el, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(function () { finish(true); }, quiet);
+hard = setTimeout(function () { finish(false); }, timeout);
+"""
+
+# Nothing left to render: document loaded, no loading spinner, no DOM mutation for
+# `quiet` ms. The observer is installed by the first call in each document.
+_SETTLED_JS = """
+var quiet = arguments[0], busy = arguments[1];
+if (document.readyState !== 'complete') return false;
+if (!window.__waitsLastMutation) {
+    window.__waitsLastMutation = Date.now();
+    new MutationObserver(function () { window.__waitsLastMutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    return false;
+}
+return Date.now() - window.__waitsLastMutation >= quiet && !document.querySelector(busy);
+"""
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_FILE = os.path.join(ROOT_DIR, ".wait_history.json")
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POLL = 0.5
+
+# Số mẫu tối đa giữ lại cho mỗi locator trong file lịch sử
+HISTORY_LIMIT = 500
+
+# elements(): trang im lặng bấy lâu (giây) mà không có match -> trả [] luôn, không chờ hết timeout
+ABSENT_QUIET = 0.5
+BUSY_CSS = ".oxd-loading-spinner"
+_ABSENT = object()
+
+
+@dataclass(frozen=True)
+class WaitRecord:
+    label: str        # "css selector=input[placeholder='Search']"
+    kind: str         # visible | clickable | present | elements | ...
+    elapsed: float    # seconds actually spent waiting
+    polls: int        # times the condition was evaluated (DOM mutations seen, for observer waits)
+    timeout: float
+    ok: bool          # False if the wait timed out
+
+
+class WaitRecorder:
+    # Thread-safe collector of every wait made in this process
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self):
+        # (waits, seconds waited, timed-out waits, seconds lost to time-outs, polls)
+        with self._lock:
+            records = list(self.records)
+        timed_out = [r for r in records if not r.ok]
+        return (
+            len(records), sum(r.elapsed for r in records),
+            len(timed_out), sum(r.elapsed for r in timed_out),
+            sum(r.polls for r in records),
+        )
+
+    def drain(self):
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+    def save_history(self, path=HISTORY_FILE):
+        # Append this session's wait durations to the history file; a timed-out wait is
+        # stored as {"timeout": seconds}, so it still pulls the suggested timeout up
+        records = self.drain()
+        if not records:
+            return
+        history = load_history(path)
+        for rec in records:
+            samples = history.setdefault(rec.label, [])
+            elapsed = round(rec.elapsed, 4)
+            samples.append(elapsed if rec.ok else {"timeout": elapsed})
+            del samples[:-HISTORY_LIMIT]
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+
+RECORDER = WaitRecorder()
+
+
+def locator_label(locator):
+    by, value = locator
+    return f"{by}={value}"
+
+
+def load_history(path=HISTORY_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def seconds(sample):
+    # History sample -> seconds waited (timed-out samples are {"timeout": seconds})
+    return sample["timeout"] if isinstance(sample, dict) else sample
+
+
+def timed_out(samples):
+    return sum(isinstance(s, dict) for s in samples)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def suggest_timeouts(history=None, pct=99, margin=1.5, floor=1.0, min_samples=20):
+    # Suggested timeout per locator: p99 of observed waits * margin (rounded up).
+    # Timed-out waits count with the time they gave up after: a lower bound of the real wait
+    history = load_history() if history is None else history
+    suggestions = {}
+    for label, samples in history.items():
+        if len(samples) >= min_samples:
+            p = percentile([seconds(s) for s in samples], pct)
+            suggestions[label] = max(floor, math.ceil(p * margin * 10) / 10)
+    return suggestions
+
+
+class Waits:
+    """
+    Bộ chờ gắn với một driver.
+    `timeouts` map locator -> timeout hoặc (timeout, poll) riêng cho locator đó.
+    """
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT, poll=DEFAULT_POLL, timeouts=None, recorder=RECORDER):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll = poll
+        self.timeouts = timeouts or {}
+        self.recorder = recorder
+
+    def _settings(self, locator, timeout, poll):
+        configured = self.timeouts.get(locator) if locator else None
+        if isinstance(configured, tuple):
+            loc_timeout, loc_poll = configured
+        else:
+            loc_timeout, loc_poll = configured, None
+        return (
+            timeout if timeout is not None else (loc_timeout if loc_timeout is not None else self.timeout),
+            poll if poll is not None else (loc_poll if loc_poll is not None else self.poll),
+        )
+
+    # ---- Core ----
+    def until(self, condition, message="", timeout=None, poll=None, label=None, kind="until", locator=None):
+        # Same contract as WebDriverWait.until, plus timing/poll instrumentation
+        return self._wait("until", condition, message, timeout, poll, label, kind, locator)
+
+    def until_not(self, condition, message="", timeout=None, poll=None, label=None, kind="until_not", locator=None):
+        # Same contract as WebDriverWait.until_not, plus timing/poll instrumentation
+        return self._wait("until_not", condition, message, timeout, poll, label, kind, locator)
+
+    def _wait(self, method, condition, message, timeout, poll, label, kind, locator):
+        timeout, poll = self._settings(locator, timeout, poll)
+        polls = 0
+
+        def counted(driver):
+            nonlocal polls
+            polls += 1
+            return condition(driver)
+
+        start = time.perf_counter()
+        ok = False
+        try:
+            with phase("waits"):
+                result = getattr(WebDriverWait(self.driver, timeout, poll_frequency=poll), method)(counted, message)
+            ok = True
+            return result
+        finally:
+            self.recorder.add(WaitRecord(
+                label or (locator_label(locator) if locator else getattr(condition, "__name__", "condition")),
+                kind, time.perf_counter() - start, polls, timeout, ok,
+            ))
+
+    # ---- Locator helpers ----
+    def visible(self, locator, timeout=None):
+        return self.until(EC.visibility_of_element_located(locator), timeout=timeout, kind="visible", locator=locator)
+
+    def clickable(self, locator, timeout=None):
+        return self.until(EC.element_to_be_clickable(locator), timeout=timeout, kind="clickable", locator=locator)
+
+    def present(self, locator, timeout=None):
+        return self.until(EC.presence_of_element_located(locator), timeout=timeout, kind="present", locator=locator)
+
+    def all_present(self, locator, timeout=None):
+        return self.until(EC.presence_of_all_elements_located(locator), timeout=timeout, kind="all_present", locator=locator)
+
+    def elements(self, locator, timeout=None):
+        # Elements matching `locator`; [] as soon as the page has settled without any
+        # (see _SETTLED_JS), or once the (per-locator) timeout expires
+        def found_or_settled(driver):
+            found = driver.find_elements(*locator)
+            if found:
+                return found
+            return _ABSENT if driver.execute_script(_SETTLED_JS, int(ABSENT_QUIET * 1000), BUSY_CSS) else None
+
+        try:
+            result = self.until(found_or_settled, timeout=timeout, kind="elements", locator=locator)
+        except TimeoutException:
+            return []
+        return [] if result is _ABSENT else result
+
+    # ---- Event-driven (MutationObserver) ----
+    def class_toggled(self, locator, cls, present=True, timeout=None):
+        # Resolve as soon as `cls` is added to (present=True) / removed from the element
+        element = self.present(locator)
+        return self._observe(_CLASS_TOGGLE_JS, locator, "class_toggled", timeout, element, cls, present)
+
+    def children_settled(self, locator, child_selector, quiet_ms=150, timeout=None):
+        # Resolve once the element's subtree has had no mutation for `quiet_ms`;
+        # returns the number of `child_selector` items at that point
+        element = self.present(locator)
+        return self._observe(_CHILDREN_SETTLED_JS, locator, "children_settled", timeout, element, child_selector, quiet_ms)["items"]
+
+    def _observe(self, script, locator, kind, timeout, *args):
+        # The browser's default script timeout (30s) bounds `timeout`
+        timeout, _ = self._settings(locator, timeout, None)
+        start = time.perf_counter()
+        result = {"ok": False, "mutations": 0}
+        try:
+            with phase("waits"):
+                result = self.driver.execute_async_script(script, *args, int(timeout * 1000))
+        finally:
+            self.recorder.add(WaitRecord(
+                locator_label(locator), kind, time.perf_counter() - start,
+                result["mutations"], timeout, result["ok"],
+            ))
+        if not result["ok"]:
+            raise TimeoutException(f"{kind} on {locator_label(locator)} not reached in {timeout}s")
+        return result
+
+
+def main():
+    suggestions = suggest_timeouts()
+    if not suggestions:
+        print(f"Not enough wait history in {HISTORY_FILE}")
+        return
+    history = load_history()
+    print(f"{'locator':70} {'samples':>7} {'timeouts':>8} {'p99 (s)':>8} {'suggested':>9}")
+    for label, value in sorted(suggestions.items(), key=lambda kv: -kv[1]):
+        samples = history[label]
+        p99 = percentile([seconds(s) for s in samples], 99)
+        print(f"{label[:70]:70} {len(samples):>7} {timed_out(samples):>8} {p99:>8.2f} {value:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()